@@ -0,0 +1,320 @@
+"""Benchmark the drawing, refresh and input paths of all cores.
+
+Usage::
+
+    python benchmark.py [-o results.json] [--budget SECONDS]
+        [--replay RECORDING] [core ...]
+
+Every core runs in a separate process.  curses and stupid are attached to a
+pseudo terminal, pygame uses SDL's dummy video driver.  The results are
+written as JSON so they can be compared between releases.  For each
+benchmark, ``per_call`` is the average time of a single call in seconds.
+For the terminal cores, ``output_bytes`` is the number of bytes that were
+written to the terminal.
+
+With ``--replay``, a recording made with :py:mod:`dirtywords.recorder` is
+also replayed as fast as possible on every core.
+
+"""
+
+import argparse
+import fcntl
+import importlib
+import io
+import json
+import os
+import platform
+import pty
+import struct
+import subprocess
+import sys
+import termios
+import threading
+import time
+
+HEIGHT = 60
+WIDTH = 200
+CORES = ['curses', 'pygame', 'stupid', 'headless']
+PTY_CORES = ['curses', 'stupid']
+
+KEY_INPUT = b'abc\x1b[A' * 25
+KEY_COUNT = 100
+
+
+def create_screen(core):
+    module = importlib.import_module('dirtywords.' + core)
+    if core in ['stupid', 'headless']:
+        return module.Screen(HEIGHT, WIDTH, ansi=True)
+    return module.Screen(HEIGHT, WIDTH)
+
+
+class Context(object):
+    def __init__(self, core, scr, input_fd, recording=None):
+        self.core = core
+        self.scr = scr
+        self.input_fd = input_fd
+        self.recording = recording
+        # called after the benchmark so that it does not affect later ones
+        self.cleanups = []
+
+    def inject(self, data):
+        """Send ``data`` as if it was typed on the keyboard."""
+        if self.core == 'headless':
+            self.scr.feed_input(data)
+        elif self.core == 'pygame':
+            import pygame
+            for ch in data.decode('ascii').replace('\x1b[A', '\0'):
+                key = pygame.K_UP if ch == '\0' else ord(ch)
+                pygame.event.post(pygame.event.Event(
+                    pygame.KEYDOWN, key=key, mod=0, unicode=ch))
+        else:
+            os.write(self.input_fd, data)
+
+
+def _lines(attrs=None):
+    from dirtywords import AttrString
+
+    lines = []
+    for ch in 'ab':
+        line = (ch + 'xyz ') * (WIDTH // 5)
+        if attrs:
+            line = AttrString(line, **attrs)
+        lines.append(line)
+    return lines
+
+
+def bench_putstr_plain(ctx):
+    lines = _lines()
+
+    def run(i):
+        ctx.scr.putstr(i % HEIGHT, 0, lines[i // HEIGHT % 2])
+    return run
+
+
+def bench_putstr_attr(ctx):
+    lines = _lines({'strong': True, 'fg_color': (0, 255, 0)})
+
+    def run(i):
+        ctx.scr.putstr(i % HEIGHT, 0, lines[i // HEIGHT % 2])
+    return run
+
+
+def bench_fill(ctx):
+    def run(i):
+        ctx.scr.fill('#.'[i % 2])
+    return run
+
+
+def bench_border(ctx):
+    def run(i):
+        ch = '-='[i % 2]
+        ctx.scr.border(ts=ch, bs=ch)
+    return run
+
+
+def bench_blit(ctx):
+    block = [line[:80] for line in _lines()] * 10
+
+    def run(i):
+        ctx.scr.blit(i % 10, i % 20, block)
+    return run
+
+
+def bench_window_refresh(ctx):
+    from dirtywords import Window
+
+    win = Window(ctx.scr, 20, 80, 5, 5)
+    ctx.cleanups.append(win.close)
+    lines = _lines()
+
+    def run(i):
+        win.putstr(i % 20, 0, lines[i // 20 % 2])
+        win.refresh()
+    return run
+
+
+def bench_refresh_full(ctx):
+    def run(i):
+        ctx.scr.fill('#.'[i % 2])
+        ctx.scr.refresh()
+    return run
+
+
+def bench_refresh_cell(ctx):
+    def run(i):
+        ctx.scr.putstr(i % HEIGHT, i % WIDTH, '#.'[i % 2])
+        ctx.scr.refresh()
+    return run
+
+
+def bench_key_decoding(ctx):
+    def run(i):
+        ctx.inject(KEY_INPUT)
+        for j in range(KEY_COUNT):
+            ctx.scr.getch()
+    return run
+
+
+def bench_replay(ctx):
+    from dirtywords.recorder import replay
+
+    def run(i):
+        with io.open(ctx.recording) as fh:
+            replay(fh, ctx.scr, speed=None)
+    return run
+
+
+BENCHMARKS = [
+    ('putstr_plain', bench_putstr_plain),
+    ('putstr_attr', bench_putstr_attr),
+    ('fill', bench_fill),
+    ('border', bench_border),
+    ('blit', bench_blit),
+    ('window_refresh', bench_window_refresh),
+    ('refresh_full', bench_refresh_full),
+    ('refresh_cell', bench_refresh_cell),
+    ('key_decoding', bench_key_decoding),
+]
+
+
+def measure(run, budget):
+    run(0)  # warm up
+    calls = 0
+    start = time.perf_counter()
+    elapsed = 0
+    while elapsed < budget or calls < 3:
+        run(calls + 1)
+        calls += 1
+        elapsed = time.perf_counter() - start
+    return {
+        'calls': calls,
+        'seconds': elapsed,
+        'per_call': elapsed / calls,
+    }
+
+
+def run_child(core, result_fd, input_fd, budget, recording=None):
+    benchmarks = list(BENCHMARKS)
+    if recording:
+        benchmarks.append(('replay', bench_replay))
+
+    results = {}
+    try:
+        scr = create_screen(core)
+    except Exception as e:
+        results['error'] = '%s: %s' % (e.__class__.__name__, e)
+    else:
+        try:
+            for name, bench in benchmarks:
+                ctx = Context(core, scr, input_fd, recording)
+                results[name] = measure(bench(ctx), budget)
+                for cleanup in ctx.cleanups:
+                    cleanup()
+                scr.refresh()
+        finally:
+            scr.cleanup()
+
+    with os.fdopen(result_fd, 'w') as fh:
+        json.dump(results, fh)
+
+
+def _drain(fd, counter):
+    while True:
+        try:
+            data = os.read(fd, 65536)
+        except OSError:
+            break
+        if not data:
+            break
+        counter[0] += len(data)
+
+
+def run_core(core, budget, recording=None):
+    r, w = os.pipe()
+    cmd = [
+        sys.executable, os.path.abspath(__file__),
+        '--child', core,
+        '--result-fd', str(w),
+        '--budget', str(budget),
+    ]
+    if recording:
+        cmd += ['--replay', os.path.abspath(recording)]
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(
+        [os.path.dirname(os.path.abspath(__file__))] +
+        env.get('PYTHONPATH', '').split(os.pathsep))
+    env['SDL_VIDEODRIVER'] = 'dummy'
+    env['PYGAME_HIDE_SUPPORT_PROMPT'] = '1'
+
+    counter = [0]
+    if core in PTY_CORES:
+        master, slave = pty.openpty()
+        fcntl.ioctl(slave, termios.TIOCSWINSZ,
+                    struct.pack('HHHH', HEIGHT, WIDTH, 0, 0))
+        env.setdefault('TERM', 'xterm-256color')
+        cmd += ['--input-fd', str(master)]
+        proc = subprocess.Popen(
+            cmd, stdin=slave, stdout=slave, env=env, pass_fds=(w, master))
+        os.close(slave)
+        drain = threading.Thread(target=_drain, args=(master, counter))
+        drain.start()
+    else:
+        proc = subprocess.Popen(
+            cmd, stdout=subprocess.DEVNULL, env=env, pass_fds=(w,))
+        drain = None
+    os.close(w)
+
+    with os.fdopen(r) as fh:
+        data = fh.read()
+    proc.wait()
+    if drain is not None:
+        drain.join()
+        os.close(master)
+
+    try:
+        results = json.loads(data)
+    except ValueError:
+        results = {'error': 'exited with status %i' % proc.returncode}
+    if drain is not None:
+        results['output_bytes'] = counter[0]
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('cores', nargs='*', default=CORES, metavar='core')
+    parser.add_argument('-o', '--output', help='write results to file')
+    parser.add_argument(
+        '--budget', type=float, default=0.2,
+        help='minimum time per benchmark in seconds (default: 0.2)')
+    parser.add_argument(
+        '--replay', metavar='RECORDING',
+        help='also benchmark replaying this recording')
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    parser.add_argument('--result-fd', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--input-fd', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.result_fd, args.input_fd, args.budget,
+                  args.replay)
+        return
+
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'size': [HEIGHT, WIDTH],
+        'cores': dict((core, run_core(core, args.budget, args.replay))
+                      for core in args.cores),
+    }
+
+    s = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w') as fh:
+            fh.write(s + '\n')
+    else:
+        print(s)
+
+
+if __name__ == '__main__':
+    main()
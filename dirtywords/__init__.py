@@ -3,13 +3,56 @@
 from __future__ import absolute_import
 from __future__ import unicode_literals
 
-try:
-    from .curses import Screen
-except ImportError:
-    try:
-        from .pygame import Screen
-    except ImportError:
-        from .stupid import Screen
+import importlib
+import os
+import sys
 
 from .base import Window
 from .base import AttrString
+from .base import FrameStats
+from .base import KeyEvent
+from .style import RichString
+from .style import Style
+
+BACKENDS = ['curses', 'pygame', 'stupid', 'headless']
+
+# tried in this order if no backend is selected explicitly
+DEFAULT_BACKENDS = ['curses', 'pygame', 'stupid']
+
+
+def get_backend(name=None):
+    """Get the ``Screen`` class of a core.
+
+    ``name`` defaults to the environment variable ``DIRTYWORDS_BACKEND``.
+    If neither is set, the first core from :py:data:`DEFAULT_BACKENDS` that
+    can be imported is used.
+
+    Cores are only imported when they are requested.
+
+    """
+    if name is None:
+        name = os.environ.get('DIRTYWORDS_BACKEND') or None
+    if name is not None:
+        if name not in BACKENDS:
+            raise ValueError('Unknown backend: %s' % name)
+        return importlib.import_module('.' + name, __name__).Screen
+
+    for name in DEFAULT_BACKENDS:
+        try:
+            return importlib.import_module('.' + name, __name__).Screen
+        except ImportError:
+            pass
+    raise ImportError('No backend available')
+
+
+def __getattr__(name):
+    # the default core is only selected when ``Screen`` is accessed
+    if name == 'Screen':
+        screen = get_backend()
+        globals()['Screen'] = screen
+        return screen
+    raise AttributeError('module %r has no attribute %r' % (__name__, name))
+
+
+if sys.version_info < (3, 7):  # no module __getattr__ (PEP 562)
+    Screen = get_backend()
@@ -0,0 +1,94 @@
+"""asyncio integration (Python 3 only).
+
+Input is read without blocking the event loop.  For cores that read from a
+file descriptor (see :py:meth:`~dirtywords.base.Core.fileno`) the descriptor
+is registered with :py:meth:`asyncio.AbstractEventLoop.add_reader`, so there
+is no polling.  Other cores (e.g. pygame) are polled every
+``poll_interval`` seconds.
+
+Example::
+
+    async def main(screen):
+        async for event in key_events(screen):
+            if event['type'] == 'keydown' and event['key'] == ord('q'):
+                break
+
+"""
+
+import asyncio
+import contextlib
+
+from .utils import monotonic
+
+
+def _root(screen):
+    while hasattr(screen, 'parent'):
+        screen = screen.parent
+    return screen
+
+
+@contextlib.contextmanager
+def _no_timeout(screen):
+    # non-blocking reads must not wait because we only read when input is
+    # known to be available
+    old = screen.input_timeout
+    screen.input_timeout = 0
+    try:
+        yield
+    finally:
+        screen.input_timeout = old
+
+
+async def _wait(screen, timeout=None, poll_interval=0.01):
+    """Wait until input is available or ``timeout`` seconds have passed."""
+    fd = screen.fileno()
+    if fd is None:
+        if timeout is not None:
+            poll_interval = min(poll_interval, timeout)
+        await asyncio.sleep(poll_interval)
+        return
+
+    loop = asyncio.get_running_loop()
+    ready = loop.create_future()
+
+    def callback():
+        if not ready.done():
+            ready.set_result(None)
+
+    loop.add_reader(fd, callback)
+    try:
+        await asyncio.wait([ready], timeout=timeout)
+    finally:
+        loop.remove_reader(fd)
+        ready.cancel()
+
+
+async def getch(screen, poll_interval=0.01):
+    """Awaitable version of :py:meth:`~dirtywords.base.Core.getch`."""
+    root = _root(screen)
+    with _no_timeout(root):
+        while True:
+            ch = screen.getch(blocking=False)
+            if ch is not None:
+                return ch
+            root.refresh_pending(force=True)
+            await _wait(root, poll_interval=poll_interval)
+
+
+async def key_events(screen, poll_interval=0.01):
+    """Async iterator version of
+    :py:meth:`~dirtywords.base.Screen.get_key_events`."""
+    root = _root(screen)
+    with _no_timeout(root):
+        while True:
+            events = list(screen.get_key_events())
+            for event in events:
+                yield event
+            if not events:
+                root.refresh_pending(force=True)
+                # keyup events are synthesized when the next key expires
+                if root._release_heap:
+                    timeout = max(0, root._release_heap[0][0] - monotonic())
+                else:
+                    timeout = None
+                await _wait(root, timeout, poll_interval)
@@ -0,0 +1,258 @@
+"""Helpers to talk to ANSI compatible terminals.
+
+:py:func:`render` draws a screen buffer.  Only the cells in the damaged spans
+are emitted.  The cursor is positioned with ``CUP`` and attributes are only
+changed with ``SGR`` when they differ from the previous cell.
+
+:py:class:`KeyDecoder` converts the bytes a terminal sends on key presses to
+key constants.
+
+"""
+
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+from .constants import KEYS
+from .constants import MODIFIERS
+from .style import DEFAULT
+
+CSI = '\x1b['
+
+ESC = 27
+
+ENTER = CSI + '?1049h' + CSI + '?25l' + CSI + '2J'
+EXIT = CSI + '0m' + CSI + '?25h' + CSI + '?1049l'
+
+_sgr_cache = {}
+
+
+def move(y, x):
+    """Move the cursor to the zero-based position ``(y, x)``."""
+    return '%s%i;%iH' % (CSI, y + 1, x + 1)
+
+
+def scroll(n, top, bottom):
+    """Scroll rows ``[top, bottom)`` up by ``n`` rows (down if negative).
+
+    A scroll region is set with ``DECSTBM`` and reset afterwards, which also
+    moves the cursor to the top left corner.
+
+    """
+    final = 'S' if n > 0 else 'T'
+    return '%s%i;%ir%s%i%s%sr' % (
+        CSI, top + 1, bottom, CSI, abs(n), final, CSI)
+
+
+def sgr(style):
+    """Get the ``SGR`` sequence for a :py:class:`~dirtywords.style.Style`.
+
+    Default colors are mapped to the terminal's default colors.
+
+    """
+    if style not in _sgr_cache:
+        codes = ['0']
+        if style.strong:
+            codes.append('1')
+        if style.emph:
+            codes.append('3')
+        if style.underline:
+            codes.append('4')
+        if style.fg_color != DEFAULT.fg_color:
+            codes.append('38;2;%i;%i;%i' % style.fg_color)
+        if style.bg_color != DEFAULT.bg_color:
+            codes.append('48;2;%i;%i;%i' % style.bg_color)
+        _sgr_cache[style] = '%s%sm' % (CSI, ';'.join(codes))
+    return _sgr_cache[style]
+
+
+def render(data, damage):
+    """Render the damaged spans of the :py:class:`~dirtywords.grid.Grid`
+    ``data`` to a string."""
+    parts = []
+    current = None
+    for y, x0, x1 in damage:
+        parts.append(move(y, x0))
+        for x, text, style in data.runs(y, x0, x1):
+            if style is not current:
+                parts.append(sgr(style))
+                current = style
+            parts.append(text)
+    if current is not None:
+        parts.append(CSI + '0m')
+    return ''.join(parts)
+
+
+# xterm encodes modifiers as ``1 + bitmask`` with shift=1, alt=2, ctrl=4
+_XTERM_MODIFIERS = dict(
+    (m + 1, (m & 1 and MODIFIERS['Shift']) |
+        (m & 2 and MODIFIERS['Alt']) |
+        (m & 4 and MODIFIERS['Ctrl']))
+    for m in range(1, 8))
+
+_CSI_LETTERS = {
+    'A': KEYS['Up'],
+    'B': KEYS['Down'],
+    'C': KEYS['Right'],
+    'D': KEYS['Left'],
+    'F': KEYS['End'],
+    'H': KEYS['Home'],
+}
+
+_SS3_LETTERS = dict(_CSI_LETTERS, **{
+    'P': KEYS['F1'],
+    'Q': KEYS['F2'],
+    'R': KEYS['F3'],
+    'S': KEYS['F4'],
+})
+
+_CSI_NUMBERS = {
+    1: KEYS['Home'],
+    2: KEYS['Insert'],
+    3: KEYS['Delete'],
+    4: KEYS['End'],
+    5: KEYS['PageUp'],
+    6: KEYS['PageDown'],
+    7: KEYS['Home'],
+    8: KEYS['End'],
+    11: KEYS['F1'],
+    12: KEYS['F2'],
+    13: KEYS['F3'],
+    14: KEYS['F4'],
+    15: KEYS['F5'],
+    17: KEYS['F6'],
+    18: KEYS['F7'],
+    19: KEYS['F8'],
+    20: KEYS['F9'],
+    21: KEYS['F10'],
+    23: KEYS['F11'],
+    24: KEYS['F12'],
+}
+
+
+def _sequences():
+    yield '\r', KEYS['Return']
+    yield '\x7f', KEYS['Backspace']
+    yield '\x1b\x1b', ESC
+
+    for letter, key in _CSI_LETTERS.items():
+        yield '\x1b[' + letter, key
+        for m, modifier in _XTERM_MODIFIERS.items():
+            yield '\x1b[1;%i%s' % (m, letter), key | modifier
+
+    for letter, key in _SS3_LETTERS.items():
+        yield '\x1bO' + letter, key
+        if letter in 'PQRS':
+            for m, modifier in _XTERM_MODIFIERS.items():
+                yield '\x1b[1;%i%s' % (m, letter), key | modifier
+
+    for n, key in _CSI_NUMBERS.items():
+        yield '\x1b[%i~' % n, key
+        for m, modifier in _XTERM_MODIFIERS.items():
+            yield '\x1b[%i;%i~' % (n, m), key | modifier
+
+
+def _build_trie(sequences):
+    # inner nodes are dicts that map bytes to nodes, leaves are keys
+    trie = {}
+    for seq, key in sequences:
+        node = trie
+        for ch in seq[:-1]:
+            node = node.setdefault(ord(ch), {})
+        node[ord(seq[-1])] = key
+    return trie
+
+
+_TRIE = _build_trie(_sequences())
+
+_CSI8 = 0x9b
+
+# number of continuation bytes by the high nibble of a UTF-8 lead byte
+_UTF8_LEAD = {0xc: 1, 0xd: 1, 0xe: 2, 0xf: 3}
+
+
+class KeyDecoder(object):
+    """Incremental decoder for keyboard input from ANSI terminals.
+
+    Bytes are passed to :py:meth:`feed` as they arrive, which returns the
+    keys that are complete.  Escape sequences are matched with a prefix
+    trie, so each byte is only looked at once.
+
+    A lone ``ESC`` can not be distinguished from the start of a sequence.
+    If :py:attr:`pending` is true, the caller should wait at most
+    :py:attr:`esc_timeout` seconds for more input and then call
+    :py:meth:`flush`.
+
+    ``ESC`` followed by a key that does not start a sequence is decoded as
+    that key with ``MODIFIERS['Alt']``.  The 8-bit ``CSI`` (``0x9b``) is
+    treated like ``ESC [``, except inside of UTF-8 characters.  Unknown
+    ``CSI`` sequences are dropped.  All other bytes are passed through
+    unchanged.
+
+    """
+
+    def __init__(self, esc_timeout=0.05):
+        self.esc_timeout = esc_timeout
+        self._node = _TRIE
+        self._buffer = bytearray()
+        self._skip_csi = False
+        # number of UTF-8 continuation bytes that are still expected
+        self._utf8 = 0
+
+    @property
+    def pending(self):
+        """Whether there is an incomplete sequence."""
+        return bool(self._buffer)
+
+    def feed(self, data):
+        """Decode ``data`` (bytes) and return a list of keys."""
+        keys = []
+        for byte in bytearray(data):
+            self._feed(byte, keys)
+        return keys
+
+    def flush(self):
+        """Give up on an incomplete sequence and return its keys."""
+        buf = self._buffer
+        self._reset()
+        if not buf:
+            return []
+        return [ESC] + self.feed(buf[1:])
+
+    def _reset(self):
+        self._node = _TRIE
+        self._buffer = bytearray()
+
+    def _feed(self, byte, keys):
+        if self._skip_csi:
+            self._skip_csi = not 64 <= byte < 127
+            return
+
+        if not self._buffer:
+            if self._utf8 and 0x80 <= byte < 0xc0:
+                self._utf8 -= 1
+                keys.append(byte)
+                return
+            self._utf8 = _UTF8_LEAD.get(byte >> 4, 0)
+            if byte == _CSI8:
+                self._feed(ESC, keys)
+                self._feed(ord('['), keys)
+                return
+
+        node = self._node.get(byte)
+        if isinstance(node, dict):
+            self._node = node
+            self._buffer.append(byte)
+        elif node is not None:
+            self._reset()
+            keys.append(node)
+        elif not self._buffer:
+            keys.append(byte)
+        else:
+            buf = self._buffer
+            self._reset()
+            if len(buf) == 1:
+                # ESC followed by a key that does not start a sequence
+                for key in self.feed(bytearray([byte])):
+                    keys.append(key | MODIFIERS['Alt'])
+            elif buf[1] == ord('[') and not 64 <= byte < 127:
+                self._skip_csi = True
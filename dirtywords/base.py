@@ -19,93 +19,70 @@ implementation is chosen.
 from __future__ import absolute_import
 from __future__ import unicode_literals
 
-from time import time
+import heapq
+import os
 import string
 
 import six
 
 from .constants import KEYS
+from .grid import Grid
+from .style import AttrString  # noqa
+from .style import RichString
+from .style import get_spans
+from .utils import monotonic
 
+_grid_class = None
 
-class AttrString(six.text_type):
-    """String with additional attributes.
 
-    Rather than specifying formatting information with :py:meth:`Core.putstr`,
-    it is saved with the string object itself. This way the formatting can be
-    used for further computation before printing it to the screen.
+def _get_grid_class():
+    # importing NumPy is slow, so it is only used on request
+    global _grid_class
+    if _grid_class is None:
+        if os.environ.get('DIRTYWORDS_GRID') == 'numpy':
+            from .numpy import NumpyGrid
+            _grid_class = NumpyGrid
+        else:
+            _grid_class = Grid
+    return _grid_class
 
-    :py:class:`AttrString` is derived from :py:class:`unicode`. You need to
-    take care of proberly decoding byte-strings yourself.
 
-    ========= ========= ================
-    name      type      description
-    ========= ========= ================
-    emph      bool      emphasis
-    strong    bool      strong emphasis
-    underline bool      underline text
-    fg_color  (r, g, b) foreground color
-    bg_color  (r, g, b) background color
-    ========= ========= ================
-
-    Example::
-
-        AttrString(u'Hello World!', strong=True, fg_color=(0, 255, 0))
-
-
-    """
-
-    def __new__(cls, s, **kwargs):
-        self = super(AttrString, cls).__new__(cls, s)
-        self.set_attrs(s, **kwargs)
-        return self
+class Core(object):
+    """Minimal core on which everything else is based.
 
-    def set_attrs(self, reference='', **kwargs):
-        defaults = {
-            'strong': False,
-            'emph': False,
-            'underline': False,
-            'fg_color': (255, 255, 255),
-            'bg_color': (0, 0, 0),
-        }
-
-        for attr in kwargs:
-            if attr not in defaults:
-                raise TypeError('No such attribute: %s' % attr)
-
-        for attr in defaults.keys():
-            if attr in kwargs:
-                value = kwargs[attr]
-            elif isinstance(reference, AttrString):
-                value = getattr(reference, attr)
-            else:
-                value = defaults[attr]
+    :py:meth:`putstr` only writes to an internal buffer (:py:attr:`data`, a
+    :py:class:`~dirtywords.grid.Grid`).  Every cell that actually changes is
+    recorded as damage so that :py:meth:`refresh` only needs to push those
+    cells to the screen.  Damage is stored as one span ``[x0, x1)`` per row.
 
-            setattr(self, attr, value)
+    A core implementation needs to provide :py:meth:`getch` and
+    :py:meth:`_flush`.
 
-    def get_attrs(self):
-        return {
-            'strong': self.strong,
-            'emph': self.emph,
-            'underline': self.underline,
-            'fg_color': self.fg_color,
-            'bg_color': self.bg_color,
-        }
+    Non-blocking calls to :py:meth:`getch` wait at most
+    :py:attr:`input_timeout` seconds for input.
 
-    def __iter__(self):
-        return (self[i] for i in range(len(self)))
+    :py:attr:`grid_class` is the type of :py:attr:`data`.  It defaults to
+    :py:class:`~dirtywords.grid.Grid`, or to
+    :py:class:`~dirtywords.numpy.NumpyGrid` if the environment variable
+    ``DIRTYWORDS_GRID`` is set to ``numpy``.
 
-    def __getitem__(self, i):
-        ch = super(AttrString, self).__getitem__(i)
-        return AttrString(ch, **self.get_attrs())
+    Cores that can scroll a part of the screen natively set
+    :py:attr:`native_scroll` and implement :py:meth:`_scroll`.
 
+    """
 
-class Core(object):
-    """Minimal core on which everything else is based."""
+    input_timeout = 0.1
+    stats = None
+    grid_class = None
+    native_scroll = False
 
     def __init__(self, height, width):
         self.height = height
         self.width = width
-        self.data = [[' ' for xx in range(width)] for yy in range(height)]
+        self.data = (self.grid_class or _get_grid_class())(height, width)
+        self._damage = {}
+        self._scrolls = []
+        self.mark_all_dirty()
 
     def getch(self, blocking=True):
         """Get a character from ``stdin``."""
@@ -113,43 +90,474 @@ class Core(object):
         # more general any non-ascii keys.
         raise NotImplementedError
 
+    def fileno(self):
+        """Get the file descriptor input is read from.
+
+        Returns ``None`` if input does not come from a file descriptor.
+
+        """
+        return None
+
+    def mark_dirty(self, y, x0, x1):
+        """Mark the cells ``[x0, x1)`` in row ``y`` as changed."""
+        if y in self._damage:
+            span = self._damage[y]
+            if x0 < span[0]:
+                span[0] = x0
+            if x1 > span[1]:
+                span[1] = x1
+        else:
+            self._damage[y] = [x0, x1]
+
+    def mark_all_dirty(self):
+        """Mark the whole screen as changed."""
+        for y in range(self.height):
+            self._damage[y] = [0, self.width]
+
+    def _scroll_dirty(self, n, top, bottom):
+        # move damage along with scrolled rows and mark new rows as dirty
+        damage = self._damage
+        self._damage = {}
+        for y, span in damage.items():
+            if top <= y < bottom:
+                y -= n
+                if not top <= y < bottom:
+                    continue
+            self._damage[y] = span
+        if n > 0:
+            exposed = range(bottom - n, bottom)
+        else:
+            exposed = range(top, top - n)
+        for y in exposed:
+            self.mark_dirty(y, 0, self.width)
+
+    def pop_dirty(self):
+        """Return and reset the list of changed ``(y, x0, x1)`` spans."""
+        damage = sorted((y, x0, x1) for y, (x0, x1) in self._damage.items())
+        self._damage = {}
+        return damage
+
     def putstr(self, y, x, s):
-        """Write string to position."""
-        for i, ch in enumerate(s):
-            try:
-                self.data[y][x + i] = ch
-            except IndexError:
-                pass
+        """Write string to position.
+
+        Characters that fall outside of the screen are ignored.  Writing the
+        same character with the same attributes again is a no-op.
+
+        """
+        stats = self.stats
+        if stats is not None:
+            start = monotonic()
+        span = self.data.put(y, x, s)
+        if span is not None:
+            self.mark_dirty(y, *span)
+        if stats is not None:
+            stats.putstr_time += monotonic() - start
+            stats.cells_written += len(s)
+
+    def blit(self, y, x, block, height=None, width=None, sy=0, sx=0):
+        """Write a two-dimensional block to position.
+
+        ``block`` can be a list of strings, another core (or its
+        :py:attr:`data`, in which case styles are copied, too) or an object
+        that supports the buffer protocol with two dimensions (e.g. a
+        :py:class:`memoryview` of codepoints or bytes).
+
+        Only the rectangle of ``height * width`` cells starting at
+        ``(sy, sx)`` in ``block`` is used.  It defaults to the rest of the
+        block.  Everything that falls outside of the screen is ignored, just
+        like with :py:meth:`putstr`.
+
+        """
+        stats = self.stats
+        if stats is not None:
+            start = monotonic()
+        if isinstance(block, Core):
+            block = block.data
+        if isinstance(block, Grid):
+            if height is None:
+                height = block.height - sy
+            if width is None:
+                width = block.width - sx
+            self._mark_spans(self.data.copy_rect(
+                block, sy, sx, y, x, height, width))
+            cells = height * width
+        else:
+            rows = _block_rows(block)[sy:]
+            if height is not None:
+                rows = rows[:height]
+            cells = 0
+            for i, row in enumerate(rows):
+                row = row[sx:] if width is None else row[sx:sx + width]
+                cells += len(row)
+                span = self.data.put(y + i, x, row)
+                if span is not None:
+                    self.mark_dirty(y + i, *span)
+
+        if stats is not None:
+            stats.putstr_time += monotonic() - start
+            stats.cells_written += cells
+
+    def _mark_spans(self, spans):
+        for y, x0, x1 in spans:
+            self.mark_dirty(y, x0, x1)
 
     def refresh(self):
         """Print the current state to the screen."""
+        self._flush_scrolls()
+        self._flush(self.pop_dirty())
+
+    def _flush_scrolls(self):
+        scrolls = self._scrolls
+        self._scrolls = []
+        for n, top, bottom in scrolls:
+            self._scroll(n, top, bottom)
+
+    def _scroll(self, n, top, bottom):
+        """Scroll rows ``[top, bottom)`` on the screen up by ``n`` rows.
+
+        If ``n`` is negative, scroll down.  Only called if
+        :py:attr:`native_scroll` is set.  It is called before
+        :py:meth:`_flush`, so rows that are scrolled in are drawn afterwards.
+
+        """
+        raise NotImplementedError
+
+    def _flush(self, damage):
+        """Push the changed spans in ``damage`` to the screen.
+
+        ``damage`` is a list of ``(y, x0, x1)`` tuples as returned by
+        :py:meth:`pop_dirty`.
+
+        """
         raise NotImplementedError
 
+    def _count_output(self, n):
+        # used by cores to report :py:attr:`FrameStats.output`
+        if self.stats is not None:
+            self.stats.output += n
+
     def cleanup(self):
         """Deinitialize screen."""
         pass
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.cleanup()
+
+
+def _repeat(s, n):
+    # like ``s * n``, but keeps the styles of the string
+    if isinstance(s, (AttrString, RichString)):
+        return RichString(six.text_type(s) * n, get_spans(s) * n)
+    return s * n
+
+
+def _block_rows(block):
+    if isinstance(block, (list, tuple)):
+        return block
+    view = memoryview(block)
+    if view.ndim != 2:
+        raise ValueError('block must have two dimensions')
+    return [''.join(
+        ch.decode('latin1') if isinstance(ch, bytes) else six.unichr(ch)
+        for ch in row
+    ) for row in view.tolist()]
+
+
+class FrameStats(object):
+    """Statistics about a single frame.
+
+    ============= =====================================================
+    name          description
+    ============= =====================================================
+    frame         number of the frame (see :py:attr:`Screen.frames`)
+    cells_written number of cells passed to :py:meth:`Core.putstr` and
+                  :py:meth:`Core.blit`
+    cells_changed number of cells in the damaged spans
+    output        bytes written (terminal cores), characters passed to
+                  curses or blits performed (pygame)
+    putstr_time   seconds spent in :py:meth:`Core.putstr` and
+                  :py:meth:`Core.blit`
+    refresh_time  seconds spent composing and flushing the frame
+    input_latency seconds from the first key read during the frame to
+                  the end of the refresh (``None`` if there was no input)
+    ============= =====================================================
+
+    """
+
+    __slots__ = (
+        'frame',
+        'cells_written',
+        'cells_changed',
+        'output',
+        'putstr_time',
+        'refresh_time',
+        'input_latency',
+    )
+
+    def __init__(self):
+        self.frame = None
+        self.cells_written = 0
+        self.cells_changed = 0
+        self.output = 0
+        self.putstr_time = 0.0
+        self.refresh_time = 0.0
+        self.input_latency = None
+
+    def __repr__(self):
+        return 'FrameStats(%s)' % ', '.join(
+            '%s=%r' % (key, getattr(self, key)) for key in self.__slots__)
+
+
+class KeyEvent(object):
+    """A keyup or keydown event.
+
+    ========= ============================================
+    name      description
+    ========= ============================================
+    type      ``'keyup'`` or ``'keydown'``
+    key       the key as returned by :py:meth:`Core.getch`
+    phase     internal state of the emulation (if any)
+    modifier  modifier state reported by the core (if any)
+    ========= ============================================
+
+    """
+
+    __slots__ = ('type', 'key', 'phase', 'modifier')
+
+    def __init__(self, type, key, phase=None, modifier=None):
+        self.type = type
+        self.key = key
+        self.phase = phase
+        self.modifier = modifier
+
+    def __getitem__(self, name):
+        try:
+            return getattr(self, name)
+        except (AttributeError, TypeError):
+            raise KeyError(name)
+
+    def get(self, name, default=None):
+        try:
+            return self[name]
+        except KeyError:
+            return default
+
+    def __repr__(self):
+        return 'KeyEvent(%r, %r)' % (self.type, self.key)
+
+
+def _visible_spans(y, x0, x1, windows):
+    """Split ``[x0, x1)`` in row ``y`` into parts not covered by windows."""
+    spans = [(x0, x1)]
+    for window in windows:
+        if not window.y <= y < window.y + window.height:
+            continue
+        wx0 = window.x
+        wx1 = window.x + window.width
+        remaining = []
+        for a, b in spans:
+            if a < wx0:
+                remaining.append((a, min(b, wx0)))
+            if b > wx1:
+                remaining.append((max(a, wx1), b))
+        spans = remaining
+    return spans
+
 
 class Screen(Core):
-    """Additional text interface utilities build on top of :py:class:`Core`."""
+    """Additional text interface utilities build on top of :py:class:`Core`.
+
+    A screen also acts as a compositor for the :py:class:`Window` objects
+    that are created on it.  On :py:meth:`refresh`, the changed parts of all
+    windows are copied into the screen (respecting their z-order) and the
+    result is flushed once.
+
+    If :py:attr:`max_fps` is set, refreshes are coalesced so that the screen
+    is flushed at most ``max_fps`` times per second.  A refresh that comes
+    too early is deferred until the next refresh after the frame interval or
+    until :py:meth:`refresh_pending` is called.  :py:attr:`frames` and
+    :py:attr:`merged_frames` count how many refreshes have been flushed and
+    how many have been merged into later frames.
+
+    """
+
+    max_fps = None
+    key_release_timeout = 0.1
 
     def __init__(self, height, width):
         super(Screen, self).__init__(height, width)
         self._pressed_keys = {}
+        self._release_heap = []
+        self._fresh_keys = []
+        self.windows = []
+        self.frames = 0
+        self.merged_frames = 0
+        self._pending = False
+        self._last_frame = None
+
+    def add_window(self, window):
+        """Register a child window.  This is done by :py:class:`Window`."""
+        self.windows.append(window)
+        self.windows.sort(key=lambda w: w.z)
+
+    def remove_window(self, window):
+        """Stop compositing ``window`` onto this screen.
+
+        What was underneath the window is not known, so its area is blanked
+        (other windows in that area are drawn again).
+
+        """
+        self.windows.remove(window)
+        self._mark_spans(self.data.fill_rect(
+            window.y, window.x, window.height, window.width))
+
+    def compose(self):
+        """Copy the changed parts of all child windows into :py:attr:`data`.
+
+        Windows are drawn in order of their ``z`` attribute.  Cells that are
+        covered by a window with a higher ``z`` are skipped.
+
+        """
+        for window in self.windows:
+            window.compose()
+
+        # restore windows where this screen has been drawn over them
+        for y, (x0, x1) in list(self._damage.items()):
+            for window in self.windows:
+                wy = y - window.y
+                wx0 = max(x0, window.x) - window.x
+                wx1 = min(x1, window.x + window.width) - window.x
+                if 0 <= wy < window.height and wx0 < wx1:
+                    window.mark_dirty(wy, wx0, wx1)
+
+        for i, window in enumerate(self.windows):
+            above = self.windows[i + 1:]
+            for wy, wx0, wx1 in window.pop_dirty():
+                y = window.y + wy
+                for x0, x1 in _visible_spans(
+                        y, window.x + wx0, window.x + wx1, above):
+                    span = self.data.copy_from(
+                        window.data, wy, x0 - window.x, y, x0, x1 - x0)
+                    if span is not None:
+                        self.mark_dirty(y, *span)
+
+    def _frame_due(self):
+        if not self.max_fps or self._last_frame is None:
+            return True
+        return monotonic() - self._last_frame >= 1.0 / self.max_fps
+
+    def _draw_frame(self):
+        self._pending = False
+        self._last_frame = monotonic()
+        self.frames += 1
+        if self.stats is None:
+            self.compose()
+            super(Screen, self).refresh()
+        else:
+            self._draw_frame_with_stats()
+
+    def enable_stats(self, callback=None):
+        """Start collecting :py:class:`FrameStats`.
+
+        The statistics of the current frame are available as
+        :py:attr:`stats`.  After each frame, ``callback`` is called with
+        them (if given) and they are saved as :py:attr:`last_stats`.
+
+        Writes to child windows are counted, too.  Nothing is collected by
+        default, which costs nothing.
+
+        """
+        cls = self.__class__
+
+        def getch(blocking=True):
+            ch = cls.getch(self, blocking=blocking)
+            if ch is not None:
+                self._stamp_input()
+            return ch
+
+        def get_key_events():
+            for event in cls.get_key_events(self):
+                self._stamp_input()
+                yield event
+
+        self.stats = FrameStats()
+        self.last_stats = None
+        self.stats_callback = callback
+        self._input_time = None
+        self.getch = getch
+        self.get_key_events = get_key_events
+
+    def disable_stats(self):
+        """Stop collecting :py:class:`FrameStats`."""
+        if self.stats is not None:
+            self.stats = None
+            del self.getch
+            del self.get_key_events
+
+    def _stamp_input(self):
+        if self._input_time is None:
+            self._input_time = monotonic()
+
+    def _draw_frame_with_stats(self):
+        stats = self.stats
+        start = monotonic()
+        self.compose()
+        self._flush_scrolls()
+        damage = self.pop_dirty()
+        stats.cells_changed = sum(x1 - x0 for y, x0, x1 in damage)
+        self._flush(damage)
+
+        end = monotonic()
+        stats.frame = self.frames
+        stats.refresh_time = end - start
+        if self._input_time is not None:
+            stats.input_latency = end - self._input_time
+            self._input_time = None
+
+        self.stats = FrameStats()
+        self.last_stats = stats
+        if self.stats_callback is not None:
+            self.stats_callback(stats)
+
+    def refresh(self):
+        """Compose all windows and print the result to the screen."""
+        if self._frame_due():
+            self._draw_frame()
+        else:
+            self._pending = True
+            self.merged_frames += 1
+
+    def refresh_pending(self, force=False):
+        """Flush a refresh that was deferred because of :py:attr:`max_fps`.
+
+        Unless ``force`` is true, this waits for the end of the frame
+        interval, i.e. it does nothing if called too early.  Cores call this
+        with ``force=True`` before blocking for input.
+
+        """
+        if self._pending and (force or self._frame_due()):
+            # the last deferred refresh is shown rather than merged
+            self.merged_frames -= 1
+            self._draw_frame()
 
     def get_key_events(self):
         """Get iterator of keyup/-down events.
 
-        The events are dictionaries of the form::
+        The events are :py:class:`KeyEvent` objects.  For backwards
+        compatibility, they can also be used like dictionaries::
 
-            {
-                'type': 'keyup',
-                'key': 32,
-            }
+            event['type'] == 'keyup'
+            event['key'] == 32
 
         The default implementation tries to emulate these using
-        :py:meth:`getch`.  It includes a short delay so that only one keydown
-        and one keyup event is triggered on repeated key presses.
+        :py:meth:`getch`.  All input that has already arrived is read on
+        each call, without waiting for more.  A key is considered released
+        if it has not been pressed again for :py:attr:`key_release_timeout`
+        seconds.  There is also a short delay so that only one keydown and
+        one keyup event is triggered on repeated key presses.
 
         """
 
@@ -171,46 +579,57 @@ class Screen(Core):
         #     -   trigger keyup event
         #     -   enter phase -1
 
-        now = time()
-        threshold = now - 0.1
-
-        for ch, detail in list(self._pressed_keys.items()):
-            t, phase = detail
-            if t < threshold:
-                del self._pressed_keys[ch]
-                if phase != 1:
-                    yield {
-                        'type': 'keyup',
-                        'key': ch,
-                        'phase': phase,
-                    }
-            # TODO if ch is pressed this will generate a redundant up/down pair
-            elif phase == 0:
-                yield {
-                    'type': 'keyup',
-                    'key': ch,
-                    'phase': phase,
-                }
-                self._pressed_keys[ch] = (now, 1)
-
-        ch = self.getch(blocking=False)
-        if ch is not None:
-            if ch not in self._pressed_keys:
-                yield {
-                    'type': 'keydown',
-                    'key': ch,
-                    'phase': -1,
-                }
-                self._pressed_keys[ch] = (now, 0)
+        # ``_pressed_keys`` maps keys to ``[deadline, phase]``.  Deadlines
+        # are also pushed to a heap so that only expired keys are looked at.
+        # Heap entries whose deadline no longer matches are stale.
+        now = monotonic()
+        deadline = now + self.key_release_timeout
+        pressed = self._pressed_keys
+        heap = self._release_heap
+
+        while heap and heap[0][0] <= now:
+            t, ch = heapq.heappop(heap)
+            state = pressed.get(ch)
+            if state is not None and state[0] == t:
+                del pressed[ch]
+                if state[1] != 1:
+                    yield KeyEvent('keyup', ch, state[1])
+
+        # TODO if ch is pressed this will generate a redundant up/down pair
+        fresh = self._fresh_keys
+        self._fresh_keys = []
+        for ch in fresh:
+            state = pressed.get(ch)
+            if state is not None and state[1] == 0:
+                yield KeyEvent('keyup', ch, 0)
+                pressed[ch] = [deadline, 1]
+                heapq.heappush(heap, (deadline, ch))
+
+        for ch in self._read_available():
+            if ch not in pressed:
+                yield KeyEvent('keydown', ch, -1)
+                pressed[ch] = [deadline, 0]
+                self._fresh_keys.append(ch)
             else:
-                t, phase = self._pressed_keys[ch]
-                if phase == 1:
-                    yield {
-                        'type': 'keydown',
-                        'key': ch,
-                        'phase': phase,
-                    }
-                self._pressed_keys[ch] = (now, 2)
+                if pressed[ch][1] == 1:
+                    yield KeyEvent('keydown', ch, 1)
+                pressed[ch] = [deadline, 2]
+            heapq.heappush(heap, (deadline, ch))
+
+    def _read_available(self):
+        # only read what has already arrived.  Otherwise a key that is held
+        # down keeps the loop busy for as long as it repeats.
+        old = self.input_timeout
+        self.input_timeout = 0
+        try:
+            keys = []
+            while True:
+                ch = self.getch(blocking=False)
+                if ch is None:
+                    return keys
+                keys.append(ch)
+        finally:
+            self.input_timeout = old
 
     def getkey(self, blocking=True):
         """Wrapper around :py:meth:`getch` that returns unicode if possible."""
@@ -238,19 +657,62 @@ class Screen(Core):
         """Delete character at position."""
         self.putstr(y, x, ' ')
 
+    def scroll(self, n=1, top=0, bottom=None):
+        """Scroll rows ``[top, bottom)`` up by ``n`` rows (down if negative).
+
+        Rows that are scrolled in are blank.  If the core supports it (see
+        :py:attr:`Core.native_scroll`), the terminal scrolls the rows itself
+        so that only the new rows need to be drawn.  Otherwise the whole
+        region is redrawn.
+
+        Child windows do not move.  The parts of this screen that were
+        hidden by them are unknown, so they are scrolled in as blanks.
+
+        """
+        if bottom is None:
+            bottom = self.height
+        top = max(top, 0)
+        bottom = min(bottom, self.height)
+        if n == 0 or top >= bottom:
+            return
+
+        # child windows stay in place, so only this screen's content moves
+        overlapping = []
+        for window in self.windows:
+            y0 = max(window.y, top)
+            y1 = min(window.y + window.height, bottom)
+            if y0 < y1:
+                overlapping.append((window, y0, y1))
+                self._mark_spans(self.data.fill_rect(
+                    y0, window.x, y1 - y0, window.width))
+
+        self.data.scroll(n, top, bottom)
+
+        if not self.native_scroll or abs(n) >= bottom - top:
+            for y in range(top, bottom):
+                self.mark_dirty(y, 0, self.width)
+        else:
+            self._scrolls.append((n, top, bottom))
+            self._scroll_dirty(n, top, bottom)
+
+        for window, y0, y1 in overlapping:
+            for wy in range(y0 - window.y, y1 - window.y):
+                window.mark_dirty(wy, 0, window.width)
+
     def fill_row(self, y, ch):
         """Fill a complete row with character."""
-        self.putstr(y, 0, ch * self.width)
+        self.putstr(y, 0, _repeat(ch, self.width))
 
     def fill_column(self, x, ch):
         """Fill a complete column with character."""
-        for y in range(self.height):
-            self.putstr(y, x, ch)
+        self.blit(0, x, [ch] * self.height)
 
     def fill(self, ch):
         """Fill whole screen with character."""
-        for y in range(self.height):
-            self.fill_row(y, ch)
+        self._mark_spans(self.data.fill_rect(
+            0, 0, self.height, self.width, ch))
+        if self.stats is not None:
+            self.stats.cells_written += self.height * self.width
 
     def clear(self):
         """Clear whole screen."""
@@ -270,22 +732,47 @@ class Screen(Core):
 
 
 class Window(Screen):
-    """A screen that is rendered onto another screen."""
+    """A screen that is rendered onto another screen.
 
-    def __init__(self, parent, height, width, y, x):
+    Windows with a higher ``z`` are drawn on top of those with a lower one.
+
+    Calling :py:meth:`refresh` refreshes the parent, which in turn picks up
+    the changes from all of its windows.  So if many windows have changed it
+    is sufficient to refresh the parent once.
+
+    """
+
+    def __init__(self, parent, height, width, y, x, z=0):
         super(Window, self).__init__(height, width)
         self.parent = parent
         self.y = y
         self.x = x
+        self.z = z
+        self.parent.add_window(self)
+
+    def close(self):
+        """Remove the window from its parent and blank its area."""
+        self.parent.remove_window(self)
+
+    @property
+    def stats(self):
+        # frames are drawn by the parent, so writes are counted there
+        return self.parent.stats
+
+    def enable_stats(self, callback=None):
+        self.parent.enable_stats(callback=callback)
+
+    def disable_stats(self):
+        self.parent.disable_stats()
 
     def getch(self, blocking=True):
         return self.parent.getch(blocking=blocking)
 
+    def fileno(self):
+        return self.parent.fileno()
+
     def get_key_events(self):
         return self.parent.get_key_events()
 
     def refresh(self):
-        for y in range(self.height):
-            for x in range(self.width):
-                self.parent.putstr(self.y + y, self.x + x, self.data[y][x])
         self.parent.refresh()
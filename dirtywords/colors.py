@@ -0,0 +1,82 @@
+"""Map RGB colors to terminal color numbers.
+
+Depending on the number of colors a terminal supports, colors are mapped to
+the 8 basic colors, the 16 ANSI colors, the xterm 256 color palette or
+passed through as 24 bit values.  Results are memoized.
+
+"""
+
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+TRUECOLOR = 2 ** 24
+
+ANSI16 = [
+    (0, 0, 0),
+    (205, 0, 0),
+    (0, 205, 0),
+    (205, 205, 0),
+    (0, 0, 238),
+    (205, 0, 205),
+    (0, 205, 205),
+    (229, 229, 229),
+    (127, 127, 127),
+    (255, 0, 0),
+    (0, 255, 0),
+    (255, 255, 0),
+    (92, 92, 255),
+    (255, 0, 255),
+    (0, 255, 255),
+    (255, 255, 255),
+]
+
+CUBE_STEPS = [0, 95, 135, 175, 215, 255]
+
+_cache = {}
+
+
+def _distance(a, b):
+    return sum((i - j) ** 2 for i, j in zip(a, b))
+
+
+def _nearest(color, palette):
+    return min(range(len(palette)), key=lambda i: _distance(color, palette[i]))
+
+
+def _nearest_step(value):
+    return min(range(6), key=lambda i: abs(CUBE_STEPS[i] - value))
+
+
+def _quantize8(color):
+    r, g, b = [int(round(c / 255.0)) for c in color]
+    return r + 2 * g + 4 * b
+
+
+def _quantize256(color):
+    r, g, b = [_nearest_step(c) for c in color]
+    cube = (CUBE_STEPS[r], CUBE_STEPS[g], CUBE_STEPS[b])
+    cube_index = 16 + 36 * r + 6 * g + b
+
+    level = min(23, max(0, int(round((sum(color) / 3.0 - 8) / 10.0))))
+    gray = (8 + 10 * level,) * 3
+    gray_index = 232 + level
+
+    if _distance(color, gray) < _distance(color, cube):
+        return gray_index
+    return cube_index
+
+
+def quantize(color, ncolors):
+    """Get the color number closest to ``color`` for ``ncolors`` colors."""
+    key = (color, ncolors)
+    if key not in _cache:
+        if ncolors >= TRUECOLOR:
+            r, g, b = color
+            _cache[key] = (r << 16) | (g << 8) | b
+        elif ncolors >= 256:
+            _cache[key] = _quantize256(color)
+        elif ncolors >= 16:
+            _cache[key] = _nearest(color, ANSI16)
+        else:
+            _cache[key] = _quantize8(color)
+    return _cache[key]
@@ -16,3 +16,13 @@ KEYS = {
     'Print': 346,  # Print
     'End': 360,  # End
 }
+
+# function keys (same values as curses.KEY_F1 and following)
+KEYS.update(('F%i' % n, 264 + n) for n in range(1, 13))
+
+# modifiers are combined with keys using bitwise or
+MODIFIERS = {
+    'Shift': 1 << 10,
+    'Alt': 1 << 11,
+    'Ctrl': 1 << 12,
+}
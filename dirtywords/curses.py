@@ -2,6 +2,7 @@ from __future__ import absolute_import
 from __future__ import unicode_literals
 
 import locale
+import sys
 
 try:
     from ncurses import curses
@@ -9,10 +10,62 @@ except ImportError:
     import curses
 
 from . import base
+from .colors import quantize
 from .constants import KEYS
+from .utils import LRUCache
+
+
+class ColorPairs(object):
+    """Allocate curses color pairs on demand.
+
+    Pairs are created for ``(fg, bg)`` combinations as they are used.  When
+    all pairs are taken, the least recently used one is redefined.  This also
+    changes the colors of any cells on screen that still use it, so the
+    combinations that lost their pair are collected until
+    :py:meth:`pop_redefined` is called.
+
+    ``size`` is capped to the number of pairs that fit into the attributes
+    (see :py:data:`curses.A_COLOR`), which is usually 256.
+
+    """
+
+    def __init__(self, size):
+        size = min(size, (curses.A_COLOR >> 8) + 1)
+        # pair 0 is reserved by curses
+        self.size = size - 1
+        self._pairs = LRUCache(self.size)
+        self._redefined = []
+
+    def _init_pair(self, pair, fg, bg):
+        curses.init_pair(pair, fg, bg)
+
+    def get(self, fg, bg):
+        """Get the number of the color pair for ``(fg, bg)``."""
+        if self.size < 1:
+            return 0
+
+        key = (fg, bg)
+        pair = self._pairs.get(key)
+        if pair is None:
+            if len(self._pairs) < self.size:
+                pair = len(self._pairs) + 1
+            else:
+                old, pair = self._pairs.popitem()
+                self._redefined.append(old)
+            self._init_pair(pair, fg, bg)
+            self._pairs[key] = pair
+        return pair
+
+    def pop_redefined(self):
+        """Get the ``(fg, bg)`` combinations that lost their pair."""
+        redefined = self._redefined
+        self._redefined = []
+        return redefined
 
 
 class Screen(base.Screen):
+    native_scroll = True
+
     def __init__(self, height, width):
         super(Screen, self).__init__(height, width)
 
@@ -24,12 +77,18 @@ class Screen(base.Screen):
         curses.curs_set(0)  # hide cursor
         locale.setlocale(locale.LC_ALL, '')
 
-        # use black background everywhere
-        for i in range(1, 8):
-            curses.init_pair(i, i, 0)
+        if curses.has_colors():
+            self.color_pairs = ColorPairs(curses.COLOR_PAIRS)
+        else:
+            self.color_pairs = ColorPairs(0)
 
         self.curses_window = curses.newwin(height, width, 0, 0)
         self.curses_window.keypad(1)
+        # allow curses to use the terminal's insert/delete line features
+        self.curses_window.idlok(1)
+
+    def fileno(self):
+        return sys.stdin.fileno()
 
     def _convert_ch(self, ch):
         mapping = {
@@ -48,6 +107,8 @@ class Screen(base.Screen):
             'Print': curses.KEY_PRINT,
             'End': curses.KEY_END,
         }
+        for n in range(1, 13):
+            mapping['F%i' % n] = curses.KEY_F1 + n - 1
 
         for key, curses_ch in mapping.items():
             if ch == curses_ch:
@@ -57,50 +118,77 @@ class Screen(base.Screen):
             return ch
 
     def getch(self, blocking=True):
+        self.refresh_pending(force=blocking)
+
         if blocking:
             self.curses_window.timeout(-1)
         else:
-            self.curses_window.timeout(100)
+            self.curses_window.timeout(int(self.input_timeout * 1000))
 
         ch = self.curses_window.getch()
         return self._convert_ch(ch)
 
     def _get_color(self, color):
-        r, g, b = color
-        r = int(round(r / 255.0))
-        g = int(round(g / 255.0))
-        b = int(round(b / 255.0))
-
-        return {
-            '000': 0,
-            '100': 1,
-            '010': 2,
-            '110': 3,
-            '001': 4,
-            '101': 5,
-            '011': 6,
-            '111': 7,
-        }.get('%i%i%i' % (r, g, b))
-
-    def putstr(self, y, x, s):
-        for i, ch in enumerate(s):
-            ch = base.AttrString(ch)
-            if ch.strong:
-                self.curses_window.attron(curses.A_BOLD)
-            if ch.underline:
-                self.curses_window.attron(curses.A_UNDERLINE)
-            color = self._get_color(ch.fg_color)
-            self.curses_window.attron(curses.color_pair(color))
-
-            try:
-                self.curses_window.addstr(y, x + i, ch.encode('utf8'))
-            except Exception:
-                pass
-
-            self.curses_window.attroff(curses.A_BOLD)
-            self.curses_window.attroff(curses.A_UNDERLINE)
-
-    def refresh(self):
+        return quantize(color, curses.COLORS)
+
+    def _get_colors(self, style):
+        return self._get_color(style.fg_color), self._get_color(style.bg_color)
+
+    def _draw_run(self, y, x, text, style):
+        pair = self.color_pairs.get(*self._get_colors(style))
+        attr = curses.color_pair(pair)
+        if style.strong:
+            attr |= curses.A_BOLD
+        if style.underline:
+            attr |= curses.A_UNDERLINE
+        self.curses_window.attrset(attr)
+        self._count_output(len(text))
+
+        try:
+            self.curses_window.addstr(y, x, text.encode('utf8'))
+        except curses.error:
+            # writing the bottom right cell moves the cursor out of the
+            # window, which curses reports as an error after drawing
+            if y != self.height - 1 or x + len(text) != self.width:
+                raise
+
+    def _scroll(self, n, top, bottom):
+        # scrolling is only enabled temporarily because otherwise writing
+        # the bottom right cell would scroll the whole window
+        win = self.curses_window
+        win.scrollok(1)
+        win.setscrreg(top, bottom - 1)
+        win.scroll(n)
+        win.setscrreg(0, self.height - 1)
+        win.scrollok(0)
+
+    def _draw(self, damage):
+        for y, x0, x1 in damage:
+            for x, text, style in self.data.runs(y, x0, x1):
+                self._draw_run(y, x, text, style)
+
+    def _find_colors(self, colors):
+        # spans of all cells on screen that use one of ``colors``
+        colors = set(colors)
+        spans = []
+        for y in range(self.height):
+            for x, text, style in self.data.runs(y):
+                if self._get_colors(style) in colors:
+                    spans.append((y, x, x + len(text)))
+        return spans
+
+    def _flush(self, damage):
+        self._draw(damage)
+
+        # cells that used a redefined pair changed color, so draw them again
+        redefined = self.color_pairs.pop_redefined()
+        if redefined:
+            self._draw(self._find_colors(redefined))
+            # if there are more colors on screen than pairs, some cells lose
+            # their pair again.  They are drawn on the next refresh.
+            self._mark_spans(self._find_colors(
+                self.color_pairs.pop_redefined()))
+
         self.curses_window.refresh()
 
     def cleanup(self):
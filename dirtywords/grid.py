@@ -0,0 +1,298 @@
+"""Compact screen buffer.
+
+A :py:class:`Grid` stores one codepoint and one style index per cell in two
+flat :py:class:`array.array` objects, which takes 8 bytes per cell and makes
+filling and copying cheap.
+
+For compatibility, ``grid[y][x]`` still works as if the grid was a list of
+lists of characters.  Cells with the default style are returned as plain
+strings, all others as :py:class:`~dirtywords.style.AttrString`.
+
+"""
+
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+from array import array
+
+import six
+
+from .style import AttrString
+from .style import DEFAULT
+from .style import Style
+from .style import get_spans
+from .style import get_style
+
+
+class Row(object):
+    """View of a single row of a :py:class:`Grid`."""
+
+    __slots__ = ('grid', 'y')
+
+    def __init__(self, grid, y):
+        self.grid = grid
+        self.y = y
+
+    def __len__(self):
+        return self.grid.width
+
+    def __iter__(self):
+        return iter(self[:])
+
+    def __getitem__(self, x):
+        if isinstance(x, slice):
+            return [self.grid.cell(self.y, i)
+                    for i in range(*x.indices(self.grid.width))]
+        if x < 0:
+            x += self.grid.width
+        if not 0 <= x < self.grid.width:
+            raise IndexError('row index out of range')
+        return self.grid.cell(self.y, x)
+
+    def __setitem__(self, x, s):
+        if isinstance(x, slice):
+            x = x.indices(self.grid.width)[0]
+        elif x < 0:
+            x += self.grid.width
+        self.grid.put(self.y, x, s)
+
+
+class Grid(object):
+    """Array backed buffer of ``height * width`` cells."""
+
+    def __init__(self, height, width):
+        self.height = height
+        self.width = width
+        self.chars = array('I', [ord(' ')]) * (height * width)
+        self.styles = array('I', [DEFAULT.index]) * (height * width)
+
+    def __len__(self):
+        return self.height
+
+    def __iter__(self):
+        return (Row(self, y) for y in range(self.height))
+
+    def __getitem__(self, y):
+        if y < 0:
+            y += self.height
+        if not 0 <= y < self.height:
+            raise IndexError('grid index out of range')
+        return Row(self, y)
+
+    def cell(self, y, x):
+        """Get the character at ``(y, x)``."""
+        i = y * self.width + x
+        ch = six.unichr(self.chars[i])
+        index = self.styles[i]
+        if index == DEFAULT.index:
+            return ch
+        return AttrString(ch, Style.registry[index])
+
+    def text(self, y, x0=0, x1=None):
+        """Get the characters of row ``y`` in ``[x0, x1)`` without styles."""
+        if x1 is None:
+            x1 = self.width
+        offset = y * self.width
+        return ''.join(map(six.unichr, self.chars[offset + x0:offset + x1]))
+
+    def runs(self, y, x0=0, x1=None):
+        """Iterate over ``(x, text, style)`` runs of cells with equal style.
+
+        Only the cells of row ``y`` in ``[x0, x1)`` are considered.
+
+        """
+        if x1 is None:
+            x1 = self.width
+        offset = y * self.width
+        chars = self.chars[offset + x0:offset + x1]
+        styles = self.styles[offset + x0:offset + x1]
+        n = len(styles)
+
+        start = 0
+        for i in range(1, n + 1):
+            if i == n or styles[i] != styles[start]:
+                text = ''.join(map(six.unichr, chars[start:i]))
+                yield x0 + start, text, Style.registry[styles[start]]
+                start = i
+
+    def put(self, y, x, s, style=None):
+        """Write ``s`` to row ``y`` starting at column ``x``.
+
+        ``style`` defaults to the style of ``s``.  The spans of a
+        :py:class:`~dirtywords.style.RichString` are written one by one.
+        Anything outside of the grid is clipped.
+
+        Returns the span ``(x0, x1)`` of cells that actually changed or
+        ``None`` if nothing changed.
+
+        """
+        if not 0 <= y < self.height or x >= self.width:
+            return None
+        if x < 0:
+            s = s[-x:]
+            x = 0
+        s = s[:self.width - x]
+        n = len(s)
+        if n == 0:
+            return None
+
+        spans = None
+        if style is None:
+            spans = get_spans(s)
+            if len(spans) == 1:
+                style = spans[0][1]
+
+        chars = array('I', map(ord, six.text_type(s)))
+        if style is not None:
+            styles = array('I', [style.index]) * n
+        else:
+            styles = array('I')
+            for length, style in spans:
+                styles.extend(array('I', [style.index]) * length)
+        return self._write(y, x, chars, styles)
+
+    def copy_from(self, src, sy, sx, dy, dx, n):
+        """Copy ``n`` cells from ``(sy, sx)`` in grid ``src`` to ``(dy, dx)``.
+
+        Anything outside of either grid is clipped.  Returns the changed
+        span like :py:meth:`put`.
+
+        """
+        if not (0 <= sy < src.height and 0 <= dy < self.height):
+            return None
+        shift = max(-sx, -dx, 0)
+        sx += shift
+        dx += shift
+        n = min(n - shift, src.width - sx, self.width - dx)
+        if n <= 0:
+            return None
+
+        chars, styles = src._row(sy, sx, n)
+        return self._write(dy, dx, chars, styles)
+
+    def copy_rect(self, src, sy, sx, dy, dx, height, width):
+        """Copy a ``height * width`` rectangle from grid ``src``.
+
+        ``src`` may be this grid, even if the rectangles overlap.  Returns
+        the list of changed ``(y, x0, x1)`` spans.
+
+        """
+        rows = range(height)
+        if src is self and dy > sy:
+            rows = reversed(rows)
+        spans = []
+        for i in rows:
+            span = self.copy_from(src, sy + i, sx, dy + i, dx, width)
+            if span is not None:
+                spans.append((dy + i,) + span)
+        return sorted(spans)
+
+    def fill_rect(self, y, x, height, width, ch=' ', style=None):
+        """Set every cell in a rectangle to ``ch``.
+
+        Returns the list of changed ``(y, x0, x1)`` spans.
+
+        """
+        if style is None:
+            style = get_style(ch)
+        spans = []
+        for i in range(max(y, 0), min(y + height, self.height)):
+            span = self.put(i, x, ch * width, style)
+            if span is not None:
+                spans.append((i,) + span)
+        return spans
+
+    def scroll(self, n, top=0, bottom=None):
+        """Move rows ``[top, bottom)`` up by ``n`` rows (down if negative).
+
+        Rows that are scrolled in are blank.
+
+        """
+        if bottom is None:
+            bottom = self.height
+        n = max(-(bottom - top), min(n, bottom - top))
+        w = self.width
+        if n > 0:
+            self.chars[top * w:(bottom - n) * w] = (
+                self.chars[(top + n) * w:bottom * w])
+            self.styles[top * w:(bottom - n) * w] = (
+                self.styles[(top + n) * w:bottom * w])
+            blank = bottom - n, bottom
+        elif n < 0:
+            self.chars[(top - n) * w:bottom * w] = (
+                self.chars[top * w:(bottom + n) * w])
+            self.styles[(top - n) * w:bottom * w] = (
+                self.styles[top * w:(bottom + n) * w])
+            blank = top, top - n
+        else:
+            return
+        size = (blank[1] - blank[0]) * w
+        self.chars[blank[0] * w:blank[1] * w] = array('I', [ord(' ')]) * size
+        self.styles[blank[0] * w:blank[1] * w] = (
+            array('I', [DEFAULT.index]) * size)
+
+    def diff(self, other):
+        """Get the ``(y, x0, x1)`` spans in which ``other`` differs.
+
+        Both grids must have the same size.
+
+        """
+        spans = []
+        for y in range(self.height):
+            a = self._row(y, 0, self.width)
+            b = other._row(y, 0, self.width)
+            if a == b:
+                continue
+            a = list(zip(*a))
+            b = list(zip(*b))
+            x0 = 0
+            while a[x0] == b[x0]:
+                x0 += 1
+            x1 = self.width
+            while a[x1 - 1] == b[x1 - 1]:
+                x1 -= 1
+            spans.append((y, x0, x1))
+        return spans
+
+    def _row(self, y, x, n):
+        # ``(chars, styles)`` of ``n`` cells as arrays
+        start = y * self.width + x
+        return self.chars[start:start + n], self.styles[start:start + n]
+
+    def _write(self, y, x, chars, styles):
+        n = len(chars)
+        start = y * self.width + x
+        end = start + n
+        old_chars = self.chars[start:end]
+        old_styles = self.styles[start:end]
+        if old_chars == chars and old_styles == styles:
+            return None
+
+        self.chars[start:end] = chars
+        self.styles[start:end] = styles
+
+        first = 0
+        while (old_chars[first] == chars[first] and
+                old_styles[first] == styles[first]):
+            first += 1
+        last = n
+        while (old_chars[last - 1] == chars[last - 1] and
+                old_styles[last - 1] == styles[last - 1]):
+            last -= 1
+        return x + first, x + last
+
+    def fill(self, ch=' ', style=None):
+        """Set every cell to ``ch``."""
+        if style is None:
+            style = get_style(ch)
+        n = self.height * self.width
+        self.chars = array('I', [ord(ch)]) * n
+        self.styles = array('I', [style.index]) * n
+
+    def copy(self):
+        grid = self.__class__.__new__(self.__class__)
+        grid.height = self.height
+        grid.width = self.width
+        grid.chars = array('I', self.chars)
+        grid.styles = array('I', self.styles)
+        return grid
@@ -0,0 +1,332 @@
+"""Headless dirtywords implementation.
+
+Nothing is printed.  Instead, the screen is rendered into a
+:py:class:`VirtualTerminal`, a minimal in-memory model of an ANSI
+terminal.  With ``ansi=True``, the ANSI byte stream produced by
+:py:func:`~dirtywords.ansi.render` is actually parsed by the virtual
+terminal; otherwise changed cells are copied directly.
+
+Input is injected with :py:meth:`Screen.feed_input` and decoded with
+:py:class:`~dirtywords.ansi.KeyDecoder`.
+
+This is useful for tests and benchmarks that need to be deterministic and
+must run without a terminal or display.
+
+"""
+
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+from collections import deque
+import re
+
+import six
+
+from . import base
+from .ansi import KeyDecoder
+from .ansi import render
+from .ansi import scroll
+from .grid import Grid
+from .style import DEFAULT
+from .style import Style
+
+_CSI_RE = re.compile('\x1b\\[([0-?]*)[ -/]*([@-~])')
+# a CSI sequence that may still be completed by more output
+_CSI_PREFIX_RE = re.compile('\x1b\\[[0-?]*[ -/]*')
+_MAX_PENDING = 64
+_TEXT_RE = re.compile('[^\x00-\x1f\x1b\x7f]+')
+
+_SGR_FLAGS = {
+    1: ('strong', True),
+    3: ('emph', True),
+    4: ('underline', True),
+    22: ('strong', False),
+    23: ('emph', False),
+    24: ('underline', False),
+}
+
+
+class VirtualTerminal(object):
+    """In-memory model of an ANSI terminal.
+
+    Supports cursor movement, erasing, ``SGR`` attributes, scroll regions
+    and the alternate screen buffer, which is what
+    :py:mod:`dirtywords.ansi` uses.  Everything else is ignored.
+
+    """
+
+    def __init__(self, height, width):
+        self.height = height
+        self.width = width
+        self.data = Grid(height, width)
+        self.y = 0
+        self.x = 0
+        self.style = DEFAULT
+        self.cursor_visible = True
+        self.top = 0
+        self.bottom = height
+        self._saved = None
+        self._rest = ''
+
+    def lines(self):
+        """Get the text of all rows as a list of strings."""
+        return [self.data.text(y) for y in range(self.height)]
+
+    def feed(self, s):
+        """Process output that was sent to the terminal."""
+        s = self._rest + s
+        self._rest = ''
+        i = 0
+        n = len(s)
+        while i < n:
+            ch = s[i]
+            if ch == '\x1b':
+                m = _CSI_RE.match(s, i)
+                if m:
+                    self._csi(m.group(1), m.group(2))
+                    i = m.end()
+                elif s.startswith('\x1b[', i):
+                    end = _CSI_PREFIX_RE.match(s, i).end()
+                    if end == n and n - i < _MAX_PENDING:
+                        # incomplete sequence
+                        self._rest = s[i:]
+                        return
+                    # invalid sequence: drop it and go on with the byte
+                    # that ended it
+                    i = end
+                elif i + 1 == n:
+                    self._rest = s[i:]
+                    return
+                elif s[i + 1] in '()':
+                    i += 3
+                else:
+                    i += 2
+            elif ch == '\r':
+                self.x = 0
+                i += 1
+            elif ch == '\n':
+                self._linefeed()
+                i += 1
+            elif ch == '\b':
+                self.x = max(0, self.x - 1)
+                i += 1
+            else:
+                m = _TEXT_RE.match(s, i)
+                if m:
+                    self._write(m.group())
+                    i = m.end()
+                else:
+                    i += 1
+
+    def _write(self, text):
+        while text:
+            if self.x >= self.width:
+                self.x = 0
+                self._linefeed()
+            chunk = text[:self.width - self.x]
+            self.data.put(self.y, self.x, chunk, self.style)
+            self.x += len(chunk)
+            text = text[len(chunk):]
+
+    def _linefeed(self):
+        if self.y == self.bottom - 1:
+            self.scroll(1)
+        elif self.y < self.height - 1:
+            self.y += 1
+
+    def _erase(self, y, x0, x1):
+        self.data.put(y, x0, ' ' * (x1 - x0), DEFAULT)
+
+    def scroll(self, n):
+        """Scroll the scroll region up by ``n`` lines (down if negative)."""
+        self.data.scroll(n, self.top, self.bottom)
+
+    def _sgr(self, params):
+        attrs = self.style.get_attrs()
+        params = list(params) or [0]
+        while params:
+            p = params.pop(0)
+            if p == 0:
+                attrs = DEFAULT.get_attrs()
+            elif p in _SGR_FLAGS:
+                attr, value = _SGR_FLAGS[p]
+                attrs[attr] = value
+            elif p in (38, 48) and params[:1] == [2] and len(params) >= 4:
+                key = 'fg_color' if p == 38 else 'bg_color'
+                attrs[key] = tuple(params[1:4])
+                params = params[4:]
+            elif p == 39:
+                attrs['fg_color'] = DEFAULT.fg_color
+            elif p == 49:
+                attrs['bg_color'] = DEFAULT.bg_color
+        self.style = Style(**attrs)
+
+    def _csi(self, params, final):
+        private = params.startswith('?')
+        params = params.lstrip('?')
+        values = [int(p or 0) for p in params.split(';')] if params else []
+        if private:
+            if final in 'hl':
+                self._set_mode(values, final == 'h')
+        elif final in _CSI_HANDLERS:
+            getattr(self, _CSI_HANDLERS[final])(_Args(values))
+
+    def _set_mode(self, values, enable):
+        if 25 in values:
+            self.cursor_visible = enable
+        if 1049 in values:
+            if enable:
+                self._saved = self.data.copy()
+                self.data.fill(' ', DEFAULT)
+            elif self._saved is not None:
+                self.data = self._saved
+                self._saved = None
+
+    def _move_to(self, args):
+        self.y = min(args.get(0, 1), self.height) - 1
+        self.x = min(args.get(1, 1), self.width) - 1
+
+    def _move_up(self, args):
+        self.y = max(0, self.y - args.get(0, 1))
+
+    def _move_down(self, args):
+        self.y = min(self.height - 1, self.y + args.get(0, 1))
+
+    def _move_right(self, args):
+        self.x = min(self.width - 1, self.x + args.get(0, 1))
+
+    def _move_left(self, args):
+        self.x = max(0, self.x - args.get(0, 1))
+
+    def _move_to_column(self, args):
+        self.x = min(args.get(0, 1), self.width) - 1
+
+    def _move_to_row(self, args):
+        self.y = min(args.get(0, 1), self.height) - 1
+
+    def _erase_display(self, args):
+        mode = args.get(0, 0)
+        if mode == 0:
+            self._erase(self.y, self.x, self.width)
+            rows = range(self.y + 1, self.height)
+        elif mode == 1:
+            self._erase(self.y, 0, self.x + 1)
+            rows = range(self.y)
+        else:
+            rows = range(self.height)
+        for y in rows:
+            self._erase(y, 0, self.width)
+
+    def _erase_line(self, args):
+        mode = args.get(0, 0)
+        x0 = self.x if mode == 0 else 0
+        x1 = self.x + 1 if mode == 1 else self.width
+        self._erase(self.y, x0, x1)
+
+    def _set_attributes(self, args):
+        self._sgr(args.values)
+
+    def _set_scroll_region(self, args):
+        self.top = args.get(0, 1) - 1
+        self.bottom = min(args.get(1, self.height), self.height)
+        self.y = 0
+        self.x = 0
+
+    def _scroll_up(self, args):
+        self.scroll(args.get(0, 1))
+
+    def _scroll_down(self, args):
+        self.scroll(-args.get(0, 1))
+
+
+class _Args(object):
+    __slots__ = ('values',)
+
+    def __init__(self, values):
+        self.values = values
+
+    def get(self, i, default):
+        # missing and zero parameters both mean "use the default"
+        if i < len(self.values) and self.values[i]:
+            return self.values[i]
+        return default
+
+
+_CSI_HANDLERS = {
+    'H': '_move_to',
+    'f': '_move_to',
+    'A': '_move_up',
+    'B': '_move_down',
+    'C': '_move_right',
+    'D': '_move_left',
+    'G': '_move_to_column',
+    'd': '_move_to_row',
+    'J': '_erase_display',
+    'K': '_erase_line',
+    'm': '_set_attributes',
+    'r': '_set_scroll_region',
+    'S': '_scroll_up',
+    'T': '_scroll_down',
+}
+
+
+class Screen(base.Screen):
+    """Screen that renders into a :py:class:`VirtualTerminal`.
+
+    The terminal is available as :py:attr:`terminal`.  If ``ansi`` is true,
+    everything that is sent to it is also collected in :py:attr:`output`
+    until it is cleared.
+
+    """
+
+    native_scroll = True
+
+    def __init__(self, height, width, ansi=False):
+        super(Screen, self).__init__(height, width)
+        self.ansi = ansi
+        self.terminal = VirtualTerminal(height, width)
+        self.output = []
+        self._decoder = KeyDecoder()
+        self._keys = deque()
+
+    def feed_input(self, data):
+        """Inject input as if it was typed on a terminal."""
+        if isinstance(data, six.text_type):
+            data = data.encode('utf8')
+        self._keys.extend(self._decoder.feed(data))
+
+    def getch(self, blocking=True):
+        """Get the next injected key.
+
+        There is nobody who could type, so this never blocks.  If there is
+        no more input, ``None`` is returned for non-blocking calls and
+        :py:exc:`EOFError` is raised for blocking ones.
+
+        """
+        self.refresh_pending(force=blocking)
+        if not self._keys and self._decoder.pending:
+            self._keys.extend(self._decoder.flush())
+        if self._keys:
+            return self._keys.popleft()
+        if blocking:
+            raise EOFError('no more input')
+
+    def _scroll(self, n, top, bottom):
+        if self.ansi:
+            s = scroll(n, top, bottom)
+            self._count_output(len(s))
+            self.output.append(s)
+            self.terminal.feed(s)
+        else:
+            self.terminal.data.scroll(n, top, bottom)
+
+    def _flush(self, damage):
+        if self.ansi:
+            s = render(self.data, damage)
+            self._count_output(len(s.encode('utf8')))
+            self.output.append(s)
+            self.terminal.feed(s)
+        else:
+            for y, x0, x1 in damage:
+                self.terminal.data.copy_from(self.data, y, x0, y, x0, x1 - x0)
+                self._count_output(x1 - x0)
@@ -0,0 +1,223 @@
+"""Text layout.
+
+:py:class:`TextView` is a :py:class:`~dirtywords.base.Window` that shows a
+list of paragraphs.  Paragraphs are wrapped (or truncated) to the width of
+the window.  Line breaks are cached per paragraph, so appending or editing
+a paragraph only lays out that paragraph again.
+
+Example::
+
+    log = TextView(screen, 20, 80, 0, 0)
+    for line in lines:
+        log.append(AttrString(line, fg_color=(0, 255, 0)))
+        log.refresh()
+
+"""
+
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+from bisect import bisect_right
+
+import six
+
+from .base import Window
+
+
+def break_lines(s, width):
+    """Get the ``(start, end)`` offsets of the lines of ``s``.
+
+    Lines are broken at the last space that fits into ``width``.  That
+    space is dropped.  Words that are longer than ``width`` are split.
+    There is always at least one line.
+
+    """
+    text = six.text_type(s)
+    width = max(width, 1)
+    n = len(text)
+    breaks = []
+    start = 0
+    while True:
+        end = start + width
+        if end >= n:
+            breaks.append((start, n))
+            return breaks
+        space = text.rfind(' ', start, end + 1)
+        if space > start:
+            breaks.append((start, space))
+            start = space + 1
+        else:
+            breaks.append((start, end))
+            start = end
+
+
+class TextView(Window):
+    """Window that shows paragraphs of text.
+
+    :py:attr:`paragraphs` may contain plain strings,
+    :py:class:`~dirtywords.AttrString` or
+    :py:class:`~dirtywords.RichString`.  They should not contain newlines.
+    Use :py:meth:`append`, :py:meth:`replace`, :py:meth:`remove` and
+    :py:meth:`clear_paragraphs` to change them so that the layout can be
+    updated incrementally.
+
+    If ``wrap`` is false, paragraphs are truncated instead of wrapped.
+
+    By default the view follows the end of the text.  Use
+    :py:meth:`scroll_to` to show a different part.
+
+    """
+
+    def __init__(self, parent, height, width, y, x, z=0, wrap=True):
+        super(TextView, self).__init__(parent, height, width, y, x, z=z)
+        self.wrap = wrap
+        self.paragraphs = []
+        self.top = None
+        self._breaks = []
+        # first line of each paragraph (only up to the first outdated one)
+        self._offsets = [0]
+        self._changed = True
+        # ``(paragraph, line)`` shown in each row (``None`` for blank rows)
+        # or ``None`` if the rows need to be drawn again
+        self._rows = None
+
+    def append(self, paragraph):
+        """Add a paragraph at the end."""
+        self.paragraphs.append(paragraph)
+        self._breaks.append(None)
+        self._changed = True
+
+    def extend(self, paragraphs):
+        """Add several paragraphs at the end."""
+        for paragraph in paragraphs:
+            self.append(paragraph)
+
+    def replace(self, i, paragraph):
+        """Replace the paragraph at index ``i``."""
+        if i < 0:
+            i += len(self.paragraphs)
+        self.paragraphs[i] = paragraph
+        self._breaks[i] = None
+        self._invalidate(i)
+
+    def remove(self, i):
+        """Remove the paragraph at index ``i``."""
+        if i < 0:
+            i += len(self.paragraphs)
+        del self.paragraphs[i]
+        del self._breaks[i]
+        self._invalidate(i)
+
+    def clear_paragraphs(self):
+        """Remove all paragraphs."""
+        del self.paragraphs[:]
+        del self._breaks[:]
+        self._invalidate(0)
+
+    def clear(self):
+        """Clear the window.
+
+        The paragraphs are kept and drawn again on the next refresh.  Use
+        :py:meth:`clear_paragraphs` to remove them.
+
+        """
+        super(TextView, self).clear()
+        self._rows = None
+        self._changed = True
+
+    def relayout(self):
+        """Lay out all paragraphs again, e.g. after changing ``wrap``."""
+        self._breaks = [None] * len(self.paragraphs)
+        self._invalidate(0)
+
+    def _invalidate(self, i):
+        del self._offsets[i + 1:]
+        self._changed = True
+        self._rows = None
+
+    def _layout(self):
+        offsets = self._offsets
+        for i in range(len(offsets) - 1, len(self.paragraphs)):
+            breaks = self._breaks[i]
+            if breaks is None:
+                paragraph = self.paragraphs[i]
+                if self.wrap:
+                    breaks = break_lines(paragraph, self.width)
+                else:
+                    breaks = [(0, min(len(paragraph), self.width))]
+                self._breaks[i] = breaks
+            offsets.append(offsets[i] + len(breaks))
+
+    @property
+    def line_count(self):
+        """Number of lines after layout."""
+        self._layout()
+        return self._offsets[-1]
+
+    def scroll_to(self, line=None):
+        """Show the text starting at ``line``.
+
+        With ``None``, the view follows the end of the text.
+
+        """
+        self.top = line
+        self._changed = True
+
+    def _visible(self):
+        # ``((paragraph, line), text)`` for every visible line
+        self._layout()
+        offsets = self._offsets
+        if self.top is None:
+            top = max(0, offsets[-1] - self.height)
+        else:
+            top = max(0, min(self.top, offsets[-1] - 1))
+
+        rows = []
+        i = bisect_right(offsets, top) - 1
+        j = top - offsets[i]
+        while i < len(self.paragraphs) and len(rows) < self.height:
+            paragraph = self.paragraphs[i]
+            for start, end in self._breaks[i][j:]:
+                rows.append(((i, j), paragraph[start:end]))
+                if len(rows) == self.height:
+                    break
+                j += 1
+            i += 1
+            j = 0
+        return rows
+
+    def visible_lines(self):
+        """Get the lines that are currently shown as strings."""
+        return [line for key, line in self._visible()]
+
+    def _draw(self):
+        rows = self._visible()
+        keys = [key for key, line in rows]
+        keys += [None] * (self.height - len(keys))
+        old = self._rows
+        if old is None:
+            # matches nothing, so every row is drawn
+            old = [()] * self.height
+
+        # when lines were appended, move the old ones instead of redrawing
+        if keys[0] is not None and keys[0] in old:
+            n = old.index(keys[0])
+            if n and old[n:] == keys[:self.height - n]:
+                self.scroll(n)
+                old = old[n:] + [None] * n
+
+        for y, (key, line) in enumerate(rows):
+            if old[y] != key:
+                self.putstr(y, 0, line)
+                self.putstr(y, len(line), ' ' * (self.width - len(line)))
+        for y in range(len(rows), self.height):
+            if old[y] is not None:
+                self.putstr(y, 0, ' ' * self.width)
+
+        self._rows = keys
+        self._changed = False
+
+    def compose(self):
+        if self._changed:
+            self._draw()
+        super(TextView, self).compose()
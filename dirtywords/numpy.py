@@ -0,0 +1,243 @@
+"""Screen buffer backed by NumPy arrays.
+
+:py:class:`NumpyGrid` has the same interface as
+:py:class:`~dirtywords.grid.Grid`, but stores codepoints and style indices in
+two-dimensional :py:mod:`numpy` arrays.  Filling, copying and scrolling
+rectangles and comparing grids are done with slice operations instead of
+Python loops.
+
+Importing NumPy takes a while, which does not pay off for small screens or
+short-lived programs.  So this buffer is only used if it is set as
+:py:attr:`dirtywords.base.Core.grid_class` or if the environment variable
+``DIRTYWORDS_GRID`` is set to ``numpy``.
+
+"""
+
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+from array import array
+import sys
+
+import numpy
+import six
+
+from .grid import Grid
+from .style import AttrString
+from .style import DEFAULT
+from .style import Style
+from .style import get_spans
+from .style import get_style
+
+# codepoints in the native byte order of ``numpy.uint32``
+_ENCODING = 'utf-32-le' if sys.byteorder == 'little' else 'utf-32-be'
+
+# strings up to this length are written cell by cell
+_SHORT = 8
+
+
+def _spans(mask, y, x):
+    # ``(y, x0, x1)`` spans that contain all true cells in each row of mask
+    rows = numpy.flatnonzero(mask.any(axis=1))
+    if not rows.size:
+        return []
+    mask = mask[rows]
+    first = mask.argmax(axis=1)
+    last = mask.shape[1] - mask[:, ::-1].argmax(axis=1)
+    return [(y + r, x + x0, x + x1) for r, x0, x1 in zip(
+        rows.tolist(), first.tolist(), last.tolist())]
+
+
+class NumpyGrid(Grid):
+    """:py:class:`~dirtywords.grid.Grid` that uses NumPy arrays."""
+
+    def __init__(self, height, width):
+        self.height = height
+        self.width = width
+        shape = (height, width)
+        self.chars = numpy.full(shape, ord(' '), dtype=numpy.uint32)
+        self.styles = numpy.full(shape, DEFAULT.index, dtype=numpy.uint32)
+
+    def _arrays(self, src):
+        # two-dimensional ``(chars, styles)`` of any grid
+        if isinstance(src, NumpyGrid):
+            return src.chars, src.styles
+        shape = (src.height, src.width)
+        return (
+            numpy.frombuffer(src.chars, dtype=numpy.uint32).reshape(shape),
+            numpy.frombuffer(src.styles, dtype=numpy.uint32).reshape(shape))
+
+    def _clip(self, src, sy, sx, dy, dx, height, width):
+        # shrink a copied rectangle so that it fits into both grids
+        for s, d, size, ssize, dsize in [
+                (sy, dy, height, src.height, self.height),
+                (sx, dx, width, src.width, self.width)]:
+            shift = max(-s, -d, 0)
+            yield s + shift, d + shift, min(
+                size - shift, ssize - s - shift, dsize - d - shift)
+
+    def cell(self, y, x):
+        ch = six.unichr(self.chars[y, x])
+        index = int(self.styles[y, x])
+        if index == DEFAULT.index:
+            return ch
+        return AttrString(ch, Style.registry[index])
+
+    def text(self, y, x0=0, x1=None):
+        return ''.join(map(six.unichr, self.chars[y, x0:x1].tolist()))
+
+    def runs(self, y, x0=0, x1=None):
+        # rows are short, so plain lists are faster than array operations
+        chars = self.chars[y, x0:x1].tolist()
+        styles = self.styles[y, x0:x1].tolist()
+        n = len(styles)
+
+        start = 0
+        for i in range(1, n + 1):
+            if i == n or styles[i] != styles[start]:
+                text = ''.join(map(six.unichr, chars[start:i]))
+                yield x0 + start, text, Style.registry[styles[start]]
+                start = i
+
+    def put(self, y, x, s, style=None):
+        if not 0 <= y < self.height or x >= self.width:
+            return None
+        if x < 0:
+            s = s[-x:]
+            x = 0
+        s = s[:self.width - x]
+        if not s:
+            return None
+
+        if style is not None:
+            spans = ((len(s), style),)
+        else:
+            spans = get_spans(s)
+        s = six.text_type(s)
+
+        if len(s) <= _SHORT:
+            indices = []
+            for length, style in spans:
+                indices += [style.index] * length
+            return self._put_short(y, x, s, indices)
+
+        chars = numpy.frombuffer(s.encode(_ENCODING), dtype=numpy.uint32)
+        if len(spans) == 1:
+            styles = spans[0][1].index
+        else:
+            styles = numpy.repeat(
+                numpy.array([style.index for length, style in spans],
+                            dtype=numpy.uint32),
+                [length for length, style in spans])
+        return self._write(y, x, chars, styles)
+
+    def _put_short(self, y, x, s, indices):
+        # for a few cells, array operations cost more than they save
+        chars = self.chars[y]
+        styles = self.styles[y]
+        first = None
+        for i, ch, index in zip(range(x, x + len(s)), map(ord, s), indices):
+            if chars[i] != ch or styles[i] != index:
+                chars[i] = ch
+                styles[i] = index
+                if first is None:
+                    first = i
+                last = i + 1
+        if first is None:
+            return None
+        return first, last
+
+    def copy_from(self, src, sy, sx, dy, dx, n):
+        (sy, dy, height), (sx, dx, n) = self._clip(
+            src, sy, sx, dy, dx, 1, n)
+        if height <= 0 or n <= 0:
+            return None
+        chars, styles = self._arrays(src)
+        return self._write(
+            dy, dx, chars[sy, sx:sx + n], styles[sy, sx:sx + n])
+
+    def copy_rect(self, src, sy, sx, dy, dx, height, width):
+        (sy, dy, height), (sx, dx, width) = self._clip(
+            src, sy, sx, dy, dx, height, width)
+        if height <= 0 or width <= 0:
+            return []
+        chars, styles = self._arrays(src)
+        chars = chars[sy:sy + height, sx:sx + width]
+        styles = styles[sy:sy + height, sx:sx + width]
+        return self._write_rect(dy, dx, chars, styles)
+
+    def fill_rect(self, y, x, height, width, ch=' ', style=None):
+        if style is None:
+            style = get_style(ch)
+        y0, y1 = max(y, 0), min(y + height, self.height)
+        x0, x1 = max(x, 0), min(x + width, self.width)
+        if y0 >= y1 or x0 >= x1:
+            return []
+        return self._write_rect(y0, x0, ord(ch), style.index, y1 - y0, x1 - x0)
+
+    def scroll(self, n, top=0, bottom=None):
+        if bottom is None:
+            bottom = self.height
+        n = max(-(bottom - top), min(n, bottom - top))
+        for a in [self.chars, self.styles]:
+            if n > 0:
+                a[top:bottom - n] = a[top + n:bottom]
+            elif n < 0:
+                a[top - n:bottom] = a[top:bottom + n]
+        if n > 0:
+            blank = slice(bottom - n, bottom)
+        elif n < 0:
+            blank = slice(top, top - n)
+        else:
+            return
+        self.chars[blank] = ord(' ')
+        self.styles[blank] = DEFAULT.index
+
+    def diff(self, other):
+        chars, styles = self._arrays(other)
+        mask = (self.chars != chars) | (self.styles != styles)
+        return _spans(mask, 0, 0)
+
+    def _row(self, y, x, n):
+        return (
+            array('I', self.chars[y, x:x + n].tobytes()),
+            array('I', self.styles[y, x:x + n].tobytes()))
+
+    def _write(self, y, x, chars, styles):
+        end = x + len(chars)
+        old_chars = self.chars[y, x:end]
+        old_styles = self.styles[y, x:end]
+        mask = (old_chars != chars) | (old_styles != styles)
+        changed = numpy.flatnonzero(mask)
+        if not changed.size:
+            return None
+        old_chars[:] = chars
+        old_styles[:] = styles
+        return x + int(changed[0]), x + int(changed[-1]) + 1
+
+    def _write_rect(self, y, x, chars, styles, height=None, width=None):
+        # chars and styles may be arrays or scalars
+        if height is None:
+            height, width = chars.shape
+        old_chars = self.chars[y:y + height, x:x + width]
+        old_styles = self.styles[y:y + height, x:x + width]
+        mask = (old_chars != chars) | (old_styles != styles)
+        spans = _spans(mask, y, x)
+        if spans:
+            old_chars[...] = chars
+            old_styles[...] = styles
+        return spans
+
+    def fill(self, ch=' ', style=None):
+        if style is None:
+            style = get_style(ch)
+        self.chars.fill(ord(ch))
+        self.styles.fill(style.index)
+
+    def copy(self):
+        grid = self.__class__.__new__(self.__class__)
+        grid.height = self.height
+        grid.width = self.width
+        grid.chars = self.chars.copy()
+        grid.styles = self.styles.copy()
+        return grid
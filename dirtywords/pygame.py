@@ -1,6 +1,7 @@
 from __future__ import absolute_import
 from __future__ import unicode_literals
 
+import os
 import string
 
 import pygame
@@ -8,16 +9,63 @@ from pygame.locals import KEYDOWN, KEYUP
 
 from . import base
 from .constants import KEYS
+from .utils import LRUCache
+
+_font_paths = {}
+
+
+def find_font(name='monospace'):
+    """Get the path of the system font ``name`` (``None`` if not found).
+
+    Looking up system fonts can be slow, so results are cached.  The
+    environment variable ``DIRTYWORDS_FONT`` can be set to the path of a
+    font file to skip the lookup completely.
+
+    """
+    path = os.environ.get('DIRTYWORDS_FONT')
+    if path:
+        return path
+    if name not in _font_paths:
+        _font_paths[name] = pygame.font.match_font(name)
+    return _font_paths[name]
 
 
 class Screen(base.Screen):
-    def __init__(self, height, width):
+    """pygame based core.
+
+    Only the parts of the window that changed are updated on refresh.  If
+    more than ``flip_threshold`` of all cells changed, the whole window is
+    updated instead.
+
+    Each run of cells with the same style is rendered with a single call to
+    :py:meth:`pygame.font.Font.render` and drawn with a single blit.  If the
+    font does not render the run exactly on the cell grid, the run is
+    assembled from individual glyphs instead.
+
+    Rendered characters are kept in :py:attr:`glyph_cache`, a
+    :py:class:`~dirtywords.utils.LRUCache` of up to ``glyph_cache_size``
+    surfaces.  Rendered runs are kept in :py:attr:`run_cache` of up to
+    ``run_cache_size`` surfaces.  Their ``hits`` and ``misses`` counters can
+    be used to tune the sizes.
+
+    """
+
+    flip_threshold = 0.5
+    native_scroll = True
+
+    def __init__(self, height, width, glyph_cache_size=1024,
+                 run_cache_size=256):
         super(Screen, self).__init__(height, width)
 
-        pygame.init()
+        # only initialize what is used (e.g. no audio or joysticks)
+        pygame.display.init()
+        pygame.font.init()
         self.clock = pygame.time.Clock()
+        self.glyph_cache = LRUCache(glyph_cache_size)
+        self.run_cache = LRUCache(run_cache_size)
+        self._scrolled = []
 
-        self.font = pygame.font.SysFont('monospace', 12)
+        self.font = pygame.font.Font(find_font(), 12)
         reference_char = 'M'  # some arbitrary char to measure the fontsize
         self.fontwidth, self.fontheight = self.font.size(reference_char)
 
@@ -38,6 +86,8 @@ class Screen(base.Screen):
             return ch
 
     def getch(self, blocking=True):
+        self.refresh_pending(force=blocking)
+
         while blocking or pygame.event.peek(KEYDOWN):
             event = pygame.event.wait()
             if event.type == KEYDOWN:
@@ -46,45 +96,115 @@ class Screen(base.Screen):
                     return ch
 
     def get_key_events(self):
+        self.refresh_pending()
+
         for event in pygame.event.get():
             if event.type == KEYDOWN:
-                yield {
-                    'type': 'keydown',
-                    'key': self._convert_ch(event.key),
-                    'modifier': event.mod,
-                }
+                yield base.KeyEvent(
+                    'keydown', self._convert_ch(event.key), modifier=event.mod)
             elif event.type == KEYUP:
-                yield {
-                    'type': 'keyup',
-                    'key': self._convert_ch(event.key),
-                    'modifier': event.mod,
-                }
+                yield base.KeyEvent(
+                    'keyup', self._convert_ch(event.key), modifier=event.mod)
+
+    def _render_ch(self, ch, style):
+        key = (ch, style)
+        surface = self.glyph_cache.get(key)
+        if surface is None:
+            surface = self._render_glyph(ch, style)
+            self.glyph_cache[key] = surface
+        return surface
 
-    def _render_ch(self, ch):
-        ch = base.AttrString(ch)
-        self.font.set_bold(ch.strong)
-        self.font.set_italic(ch.emph)
-        self.font.set_underline(ch.underline)
+    def _render_run(self, text, style):
+        if len(text) == 1:
+            return self._render_ch(text, style)
+        key = (text, style)
+        surface = self.run_cache.get(key)
+        if surface is None:
+            surface = self._render_text(text, style)
+            self.run_cache[key] = surface
+        return surface
+
+    def _set_font_style(self, style):
+        self.font.set_bold(style.strong)
+        self.font.set_italic(style.emph)
+        self.font.set_underline(style.underline)
 
-        s = self.font.render(ch, False, ch.fg_color, ch.bg_color)
+    def _render_glyph(self, ch, style):
+        self._set_font_style(style)
+        s = self.font.render(ch, False, style.fg_color, style.bg_color)
 
         # make sure the returned surface has the right dimensions
         surface = pygame.Surface((self.fontwidth, self.fontheight))
-        surface.fill(ch.bg_color)
+        surface.fill(style.bg_color)
         surface.blit(s, (0, 0))
         return surface
 
-    def putstr(self, y, x, s):
-        super(Screen, self).putstr(y, x, s)
-        for i, ch in enumerate(s):
-            self.pygame_screen.blit(
-                self._render_ch(ch),
-                ((x + i) * self.fontwidth, y * self.fontheight),
-                area=(0, 0, self.fontwidth, self.fontheight))
+    def _render_text(self, text, style):
+        surface = pygame.Surface((len(text) * self.fontwidth, self.fontheight))
+        surface.fill(style.bg_color)
+
+        self._set_font_style(style)
+        if self.font.size(text)[0] == len(text) * self.fontwidth:
+            s = self.font.render(text, False, style.fg_color, style.bg_color)
+            surface.blit(s, (0, 0))
+        else:
+            # wide or missing glyphs would not line up with the cells
+            for i, ch in enumerate(text):
+                surface.blit(
+                    self._render_ch(ch, style), (i * self.fontwidth, 0))
+        return surface
 
-    def refresh(self):
+    def _get_rects(self, damage):
+        # merge spans in consecutive rows that cover the same columns
+        rects = []
+        for y, x0, x1 in damage:
+            if rects:
+                ry, rx0, rx1, rheight = rects[-1]
+                if (rx0, rx1) == (x0, x1) and ry + rheight == y:
+                    rects[-1][3] += 1
+                    continue
+            rects.append([y, x0, x1, 1])
+
+        return [pygame.Rect(
+            x0 * self.fontwidth,
+            y * self.fontheight,
+            (x1 - x0) * self.fontwidth,
+            height * self.fontheight,
+        ) for y, x0, x1, height in rects]
+
+    def _scroll(self, n, top, bottom):
+        # self-blit of the region, limited by the clipping rectangle
+        rect = pygame.Rect(
+            0,
+            top * self.fontheight,
+            self.width * self.fontwidth,
+            (bottom - top) * self.fontheight)
+        self.pygame_screen.set_clip(rect)
+        self.pygame_screen.scroll(0, -n * self.fontheight)
+        self.pygame_screen.set_clip(None)
+        self._scrolled.append(rect)
+        self._count_output(1)
+
+    def _flush(self, damage):
+        blits = 0
+        for y, x0, x1 in damage:
+            for x, text, style in self.data.runs(y, x0, x1):
+                self.pygame_screen.blit(
+                    self._render_run(text, style),
+                    (x * self.fontwidth, y * self.fontheight))
+                blits += 1
+        self._count_output(blits)
+
+        # measure the actual frame rate (see ``clock.get_fps()``)
         self.clock.tick()
-        pygame.display.flip()
+
+        dirty = sum(x1 - x0 for y, x0, x1 in damage)
+        scrolled = self._scrolled
+        self._scrolled = []
+        if dirty > self.height * self.width * self.flip_threshold:
+            pygame.display.flip()
+        elif damage or scrolled:
+            pygame.display.update(self._get_rects(damage) + scrolled)
 
     def cleanup(self):
         pygame.quit()
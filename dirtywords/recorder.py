@@ -0,0 +1,205 @@
+"""Record and replay what a screen displays.
+
+Recordings are newline delimited JSON, similar to asciicast.  The first line
+is a header with the size of the screen.  Every further line is an event
+``[time, type, data]``:
+
+- ``"s"``: defines a style.  ``data`` is ``[id, attrs]``.
+- ``"r"``: the next frame starts by scrolling.  ``data`` is
+  ``[n, top, bottom]`` (see :py:meth:`~dirtywords.base.Screen.scroll`).
+- ``"k"``: a keyframe that contains the complete screen.
+- ``"f"``: a frame that only contains the cells that changed since the
+  previous frame.
+
+The cells of a frame are stored as runs ``[y, x, text, style_id]``.
+Keyframes are written every ``keyframe_interval`` frames so that a replay
+can start in the middle without applying every frame before.
+
+For long sessions, the recording can be compressed on the fly::
+
+    with gzip.open('session.rec.gz', 'wt') as fh:
+        with Recorder(screen, fh):
+            run_app(screen)
+
+"""
+
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import json
+import time
+
+from .style import AttrString
+from .style import Style
+from .utils import monotonic
+
+VERSION = 1
+
+
+class Recorder(object):
+    """Record every frame that ``screen`` flushes to ``fh``.
+
+    Frames are compared with a copy of the previous frame.  Native scrolling
+    (see :py:attr:`~dirtywords.base.Core.native_scroll`) is recorded as
+    such, so a scrolled frame only stores the new rows.
+
+    ``screen`` should be the top level screen, not a window.
+
+    """
+
+    def __init__(self, screen, fh, keyframe_interval=300):
+        self.screen = screen
+        self.fh = fh
+        self.keyframe_interval = keyframe_interval
+        self.frames = 0
+        self._styles = set()
+        self._shadow = screen.data.copy()
+        self._start = monotonic()
+
+        self._write({
+            'version': VERSION,
+            'height': screen.height,
+            'width': screen.width,
+            'keyframe_interval': keyframe_interval,
+        })
+
+        self._scrolls = []
+        self._flush = screen._flush
+        self._flush_scrolls = screen._flush_scrolls
+        screen._flush = self._record_and_flush
+        screen._flush_scrolls = self._record_and_flush_scrolls
+
+    def _write(self, obj):
+        self.fh.write(json.dumps(obj, separators=(',', ':')) + '\n')
+
+    def _record_and_flush_scrolls(self):
+        for n, top, bottom in self.screen._scrolls:
+            self._shadow.scroll(n, top, bottom)
+            self._scrolls.append([n, top, bottom])
+        self._flush_scrolls()
+
+    def _record_and_flush(self, damage):
+        self.record()
+        self._flush(damage)
+
+    def record(self):
+        """Write the current content of the screen as a frame."""
+        t = round(monotonic() - self._start, 6)
+        data = self.screen.data
+        if self.frames % self.keyframe_interval == 0:
+            kind = 'k'
+            spans = [(y, 0, data.width) for y in range(data.height)]
+        else:
+            kind = 'f'
+            spans = self._shadow.diff(data)
+            if not spans and not self._scrolls:
+                return
+
+        for scroll in self._scrolls:
+            self._write([t, 'r', scroll])
+        self._scrolls = []
+
+        runs = []
+        for y, x0, x1 in spans:
+            self._shadow.copy_from(data, y, x0, y, x0, x1 - x0)
+            for x, text, style in data.runs(y, x0, x1):
+                if style.index not in self._styles:
+                    self._styles.add(style.index)
+                    self._write([t, 's', [style.index, style.get_attrs()]])
+                runs.append([y, x, text, style.index])
+        self._write([t, kind, runs])
+        self.frames += 1
+
+    def close(self):
+        """Stop recording."""
+        if self.screen.__dict__.get('_flush') == self._record_and_flush:
+            del self.screen._flush
+            del self.screen._flush_scrolls
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class Recording(object):
+    """Read a recording from ``fh``.
+
+    The size of the recorded screen is available as :py:attr:`height` and
+    :py:attr:`width`.  Iterating yields ``(time, keyframe, scrolls, runs)``
+    for every frame, where ``scrolls`` is a list of ``(n, top, bottom)`` and
+    ``runs`` is a list of ``(y, x, text, style)``.
+
+    """
+
+    def __init__(self, fh):
+        self.fh = fh
+        header = json.loads(fh.readline())
+        if header.get('version') != VERSION:
+            raise ValueError('Unsupported recording version')
+        self.height = header['height']
+        self.width = header['width']
+
+    def __iter__(self):
+        styles = {}
+        scrolls = []
+        for line in self.fh:
+            t, kind, data = json.loads(line)
+            if kind == 's':
+                index, attrs = data
+                styles[index] = Style(**attrs)
+            elif kind == 'r':
+                scrolls.append(tuple(data))
+            elif kind in 'kf':
+                runs = [(y, x, text, styles[index])
+                        for y, x, text, index in data]
+                yield t, kind == 'k', scrolls, runs
+                scrolls = []
+
+
+def replay(fh, screen, speed=1.0, start=0):
+    """Show the recording from ``fh`` on ``screen``.
+
+    This works with any core.  Frames are shown ``speed`` times faster than
+    they were recorded.  If ``speed`` is ``None``, they are shown as fast as
+    possible, which is useful for benchmarks.
+
+    Frames before ``start`` seconds are not shown.  Only the frames since
+    the last keyframe before ``start`` are applied.
+
+    Returns the number of frames that were shown.
+
+    """
+    frames = 0
+    skipped = []
+    t0 = None
+    for t, keyframe, scrolls, runs in Recording(fh):
+        if t < start:
+            if keyframe:
+                skipped = []
+            skipped.append((scrolls, runs))
+            continue
+        for frame in skipped:
+            _apply(screen, *frame)
+        skipped = []
+
+        if speed is not None:
+            now = monotonic()
+            if t0 is None:
+                t0 = now - (t - start) / speed
+            delay = t0 + (t - start) / speed - now
+            if delay > 0:
+                time.sleep(delay)
+
+        _apply(screen, scrolls, runs)
+        screen.refresh()
+        frames += 1
+    return frames
+
+
+def _apply(screen, scrolls, runs):
+    for n, top, bottom in scrolls:
+        screen.scroll(n, top, bottom)
+    for y, x, text, style in runs:
+        screen.putstr(y, x, AttrString(text, style))
@@ -2,8 +2,17 @@
 
 Simply prints to ``stdout`` with some lines space at the top.
 
+If ``ansi=True`` is passed, the screen is instead drawn on the alternate
+screen buffer of an ANSI compatible terminal.  In this mode only the cells
+that changed since the last refresh are written.
+
 The :py:meth:`Screen.getch` implementation should be more or less
-cross-platform.
+cross-platform.  Escape sequences are decoded with
+:py:class:`~dirtywords.ansi.KeyDecoder`.  On unix, the terminal is put into
+raw mode for the lifetime of the screen, so make sure to call
+:py:meth:`Screen.cleanup` (or use the screen as a context manager).  Signal
+keys like Ctrl-C still work.  If ``stdin`` is closed, :py:meth:`Screen.getch`
+raises :py:exc:`EOFError`.
 
 """
 
@@ -11,95 +20,147 @@ from __future__ import absolute_import
 from __future__ import print_function
 from __future__ import unicode_literals
 
+from collections import deque
+import errno
+import os
+import select
+import sys
+
 import six
 
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+try:
+    import termios
+    import tty
+except ImportError:
+    termios = None
+
 from . import base
-from .constants import KEYS
+from .ansi import ENTER
+from .ansi import EXIT
+from .ansi import KeyDecoder
+from .ansi import render
+from .ansi import scroll
 
 
 class Screen(base.Screen):
-    def __init__(self, height, width):
+    def __init__(self, height, width, ansi=False):
         super(Screen, self).__init__(height, width)
 
-        self._pressed_keys = {}
-
-    def _getch(self, blocking=True):
-        # http://code.activestate.com/recipes/134892/
-
-        try:  # windows
-            import msvcrt
-
-            if blocking or msvcrt.kbhit():
-                return ord(msvcrt.getch())
-
-        except ImportError:  # unix
-            import sys
-            import termios
-            import tty
-            import select
-
-            fd = sys.stdin.fileno()
-
-            old_settings = termios.tcgetattr(fd)
-            tty.setraw(sys.stdin.fileno())
-
-            try:
-                if blocking or sys.stdin in select.select(
-                        [sys.stdin], [], [], 0.1)[0]:
-                    return ord(sys.stdin.read(1))
-            finally:
-                termios.tcsetattr(sys.stdin, termios.TCSADRAIN, old_settings)
-
-    def _codes2key(self, l):
-        codes = {
-            '13': KEYS['Return'],
-            '127': KEYS['Backspace'],
-            '27, 27': 27,
-            '27, 91, 70': KEYS['End'],
-            '27, 91, 72': KEYS['Home'],
-            '27, 91, 50, 126': KEYS['Insert'],
-            '27, 91, 51, 126': KEYS['Delete'],
-            '27, 91, 53, 126': KEYS['PageUp'],
-            '27, 91, 54, 126': KEYS['PageDown'],
-            '27, 91, 65': KEYS['Up'],
-            '27, 91, 66': KEYS['Down'],
-            '27, 91, 67': KEYS['Right'],
-            '27, 91, 68': KEYS['Left'],
-        }
-        key = ', '.join([six.text_type(i) for i in l])
-        if key in codes:
-            return codes[key]
-        elif len(l) == 1:
-            return l[0]
+        self.ansi = ansi
+        self.native_scroll = ansi
+        self._decoder = KeyDecoder()
+        self._keys = deque()
+        self._old_settings = None
+
+        self._enter_raw_mode()
+        if self.ansi:
+            self._write(ENTER)
+
+    def _enter_raw_mode(self):
+        # raw mode is kept for the lifetime of the screen and reset in
+        # :py:meth:`cleanup`
+        if termios is None or not sys.stdin.isatty():
+            return
+
+        fd = sys.stdin.fileno()
+        self._old_settings = termios.tcgetattr(fd)
+        tty.setraw(fd)
+
+        # keep output processing so that newlines still work and signal
+        # keys so that Ctrl-C and Ctrl-Z still work
+        attrs = termios.tcgetattr(fd)
+        attrs[1] |= termios.OPOST
+        attrs[3] |= termios.ISIG
+        termios.tcsetattr(fd, termios.TCSADRAIN, attrs)
+
+    def _write(self, s):
+        if six.PY2:
+            s = s.encode('utf8')
+            self._count_output(len(s))
+        elif self.stats is not None:
+            self._count_output(len(s.encode('utf8')))
+        sys.stdout.write(s)
+        sys.stdout.flush()
+
+    def fileno(self):
+        if msvcrt is None:
+            return sys.stdin.fileno()
+
+    def _read(self, timeout):
+        """Read all available bytes from ``stdin``.
+
+        Waits at most ``timeout`` seconds (forever if ``None``).  Raises
+        :py:exc:`EOFError` if ``stdin`` has been closed.
+
+        """
+        if msvcrt is not None:
+            if timeout is None or msvcrt.kbhit():
+                return msvcrt.getch()
+            return b''
+
+        fd = sys.stdin.fileno()
+        if not select.select([fd], [], [], timeout)[0]:
+            return b''
+        try:
+            data = os.read(fd, 1024)
+        except OSError as e:
+            # a pseudo terminal reports a closed master as EIO
+            if e.errno != errno.EIO:
+                raise
+            data = b''
+        if not data:
+            raise EOFError('stdin was closed')
+        return data
 
     def getch(self, blocking=True):
-        # Convert ANSI escape sequences to key constants
-        # This is implemented as a wrapper around :py:meth:`_getch` because
-        # it needs to get a variable number of bytes from stdin.
-        chars = [self._getch(blocking=blocking)]
-
-        if chars == [27]:
-            # TODO: single ESC is valid, so this should not block
-            chars.append(self._getch())
-        elif chars == [155]:
-            chars = [27, 91]
-
-        if chars[0] == 27:
-            if chars[1] == 91:
-                chars.append(self._getch())
-                while chars[-1] not in range(64, 127):
-                    chars.append(self._getch())
-            elif chars[1] == 79:
-                chars.append(self._getch())
-            elif chars[-1] in range(64, 96):
-                pass
-            else:
-                # invalid?
-                pass
+        self.refresh_pending(force=blocking)
 
-        return self._codes2key(chars)
+        while not self._keys:
+            if self._decoder.pending:
+                timeout = self._decoder.esc_timeout
+            elif blocking:
+                timeout = None
+            else:
+                timeout = self.input_timeout
 
-    def refresh(self):
-        spacing = '\n' * self.height * 2
-        s = '\n'.join([''.join(row) for row in self.data])
-        print(spacing + s.encode('utf8'))
+            try:
+                data = self._read(timeout)
+            except EOFError:
+                # return what is left before giving up
+                if not self._decoder.pending:
+                    raise
+                data = b''
+            if data:
+                self._keys.extend(self._decoder.feed(data))
+            elif self._decoder.pending:
+                self._keys.extend(self._decoder.flush())
+            elif not blocking:
+                return None
+
+        return self._keys.popleft()
+
+    def _scroll(self, n, top, bottom):
+        self._write(scroll(n, top, bottom))
+
+    def _flush(self, damage):
+        if self.ansi:
+            if damage:
+                self._write(render(self.data, damage))
+        else:
+            # without ANSI support, print the complete screen
+            spacing = '\n' * self.height * 2
+            s = '\n'.join([''.join(row) for row in self.data])
+            self._write(spacing + s + '\n')
+
+    def cleanup(self):
+        if self.ansi:
+            self._write(EXIT)
+        if self._old_settings is not None:
+            termios.tcsetattr(
+                sys.stdin.fileno(), termios.TCSADRAIN, self._old_settings)
+            self._old_settings = None
@@ -0,0 +1,273 @@
+"""Immutable, shared text attributes and strings that carry them.
+
+Every distinct combination of attributes exists exactly once as a
+:py:class:`Style` object.  This way styles can be compared by identity and
+many characters can share a single style without any per-character
+allocations.
+
+"""
+
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import six
+
+ATTRS = ('strong', 'emph', 'underline', 'fg_color', 'bg_color')
+
+
+class Style(object):
+    """Interned set of text attributes.
+
+    Styles are immutable.  Use :py:meth:`replace` to get a modified copy.
+    Each style also has a small integer :py:attr:`index` that can be used to
+    look it up in :py:data:`Style.registry`.
+
+    """
+
+    __slots__ = ATTRS + ('index',)
+
+    _instances = {}
+    registry = []
+
+    def __new__(cls, strong=False, emph=False, underline=False,
+                fg_color=(255, 255, 255), bg_color=(0, 0, 0)):
+        key = (
+            bool(strong),
+            bool(emph),
+            bool(underline),
+            tuple(fg_color),
+            tuple(bg_color),
+        )
+
+        try:
+            return cls._instances[key]
+        except KeyError:
+            pass
+
+        self = super(Style, cls).__new__(cls)
+        for attr, value in zip(ATTRS, key):
+            object.__setattr__(self, attr, value)
+        object.__setattr__(self, 'index', len(cls.registry))
+
+        cls._instances[key] = self
+        cls.registry.append(self)
+        return self
+
+    def __setattr__(self, attr, value):
+        raise AttributeError('Style objects are immutable')
+
+    def __reduce__(self):
+        return (Style, tuple(getattr(self, attr) for attr in ATTRS))
+
+    def __repr__(self):
+        return 'Style(%s)' % ', '.join(
+            '%s=%r' % (attr, getattr(self, attr)) for attr in ATTRS)
+
+    def replace(self, **kwargs):
+        """Get a style with some attributes changed."""
+        for attr in kwargs:
+            if attr not in ATTRS:
+                raise TypeError('No such attribute: %s' % attr)
+        attrs = self.get_attrs()
+        attrs.update(kwargs)
+        return Style(**attrs)
+
+    def get_attrs(self):
+        return dict((attr, getattr(self, attr)) for attr in ATTRS)
+
+
+DEFAULT = Style()
+
+
+def get_style(s):
+    """Get the style of a string (:py:data:`DEFAULT` for plain strings)."""
+    return getattr(s, 'style', DEFAULT)
+
+
+def get_spans(s):
+    """Get the ``(length, style)`` spans of a string.
+
+    Only :py:class:`RichString` can have more than one span.
+
+    """
+    spans = getattr(s, 'spans', None)
+    if spans is None:
+        return ((len(s), get_style(s)),) if s else ()
+    return spans
+
+
+def _merge(spans):
+    # drop empty spans and join neighbours with the same style
+    merged = []
+    for length, style in spans:
+        if not length:
+            continue
+        if merged and merged[-1][1] is style:
+            merged[-1] = (merged[-1][0] + length, style)
+        else:
+            merged.append((length, style))
+    return tuple(merged)
+
+
+def _style_property(attr):
+    # assigning replaces the style of this string only
+    def fset(self, value):
+        self.style = self.style.replace(**{attr: value})
+    return property(lambda self: getattr(self.style, attr), fset)
+
+
+class AttrString(six.text_type):
+    """String with additional attributes.
+
+    Rather than specifying formatting information with :py:meth:`Core.putstr`,
+    it is saved with the string object itself. This way the formatting can be
+    used for further computation before printing it to the screen.
+
+    :py:class:`AttrString` is derived from :py:class:`unicode`. You need to
+    take care of proberly decoding byte-strings yourself.
+
+    The attributes are stored in a shared :py:class:`~dirtywords.style.Style`
+    object which is available as :py:attr:`style`.  Instead of keyword
+    arguments, a style can also be passed directly.  Assigning an attribute
+    (or calling :py:meth:`set_attrs`) only changes this string.
+
+    ========= ========= ================
+    name      type      description
+    ========= ========= ================
+    emph      bool      emphasis
+    strong    bool      strong emphasis
+    underline bool      underline text
+    fg_color  (r, g, b) foreground color
+    bg_color  (r, g, b) background color
+    ========= ========= ================
+
+    Example::
+
+        AttrString(u'Hello World!', strong=True, fg_color=(0, 255, 0))
+
+
+    """
+
+    __slots__ = ('style',)
+
+    def __new__(cls, s, style=None, **kwargs):
+        self = super(AttrString, cls).__new__(cls, s)
+        if style is None:
+            style = get_style(s)
+        self.style = style.replace(**kwargs) if kwargs else style
+        return self
+
+    strong = _style_property('strong')
+    emph = _style_property('emph')
+    underline = _style_property('underline')
+    fg_color = _style_property('fg_color')
+    bg_color = _style_property('bg_color')
+
+    def set_attrs(self, reference='', **kwargs):
+        """Replace the attributes by those of ``reference`` and ``kwargs``.
+
+        Only this string is changed.  The :py:class:`Style` itself is
+        immutable and may be shared with other strings.
+
+        """
+        self.style = get_style(reference).replace(**kwargs)
+
+    def get_attrs(self):
+        return self.style.get_attrs()
+
+    def __iter__(self):
+        style = self.style
+        for ch in six.text_type(self):
+            yield AttrString(ch, style)
+
+    def __getitem__(self, i):
+        s = super(AttrString, self).__getitem__(i)
+        return AttrString(s, self.style)
+
+    def __add__(self, other):
+        return RichString(self) + other
+
+    def __radd__(self, other):
+        return RichString(other) + self
+
+
+class RichString(six.text_type):
+    """String with different attributes for different parts.
+
+    The attributes are stored as run-length encoded :py:attr:`spans`, a tuple
+    of ``(length, style)`` pairs.  Concatenation and slicing only need to
+    look at the spans, not at the individual characters.
+
+    Adding :py:class:`AttrString` objects results in a
+    :py:class:`RichString`::
+
+        line = AttrString('error', fg_color=(255, 0, 0)) + ': file not found'
+
+    """
+
+    __slots__ = ('spans',)
+
+    def __new__(cls, s='', spans=None):
+        self = super(RichString, cls).__new__(cls, s)
+        if spans is None:
+            self.spans = get_spans(s)
+        else:
+            self.spans = _merge(spans)
+            if sum(length for length, style in self.spans) != len(self):
+                raise ValueError('spans do not match the length of the string')
+        return self
+
+    def runs(self):
+        """Iterate over ``(text, style)`` pairs."""
+        start = 0
+        for length, style in self.spans:
+            yield six.text_type.__getitem__(
+                self, slice(start, start + length)), style
+            start += length
+
+    def style_at(self, i):
+        """Get the style of the character at index ``i``."""
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError('string index out of range')
+        for length, style in self.spans:
+            if i < length:
+                return style
+            i -= length
+
+    def __iter__(self):
+        for text, style in self.runs():
+            for ch in text:
+                yield AttrString(ch, style)
+
+    def __getitem__(self, i):
+        s = super(RichString, self).__getitem__(i)
+        if not isinstance(i, slice):
+            return AttrString(s, self.style_at(i))
+
+        start, stop, step = i.indices(len(self))
+        if step != 1:
+            return RichString(s, [
+                (1, self.style_at(j)) for j in range(start, stop, step)])
+
+        spans = []
+        pos = 0
+        for length, style in self.spans:
+            end = pos + length
+            if end > start and pos < stop:
+                spans.append((min(end, stop) - max(pos, start), style))
+            pos = end
+        return RichString(s, spans)
+
+    def __add__(self, other):
+        if not isinstance(other, six.string_types):
+            return NotImplemented
+        s = six.text_type.__add__(self, other)
+        return RichString(s, self.spans + get_spans(other))
+
+    def __radd__(self, other):
+        if not isinstance(other, six.string_types):
+            return NotImplemented
+        s = six.text_type.__add__(six.text_type(other), self)
+        return RichString(s, get_spans(other) + self.spans)
@@ -0,0 +1,53 @@
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+from collections import OrderedDict
+
+try:
+    from time import monotonic
+except ImportError:  # python 2
+    from time import time as monotonic  # noqa
+
+
+class LRUCache(object):
+    """Mapping with limited size that drops the least recently used items.
+
+    The number of lookups that succeeded or failed are counted in
+    :py:attr:`hits` and :py:attr:`misses`.
+
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        try:
+            value = self._data.pop(key)
+        except KeyError:
+            self.misses += 1
+            return default
+        self._data[key] = value
+        self.hits += 1
+        return value
+
+    def __setitem__(self, key, value):
+        self._data.pop(key, None)
+        self._data[key] = value
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def popitem(self):
+        """Remove and return the least recently used ``(key, value)``."""
+        return self._data.popitem(last=False)
+
+    def clear(self):
+        self._data.clear()
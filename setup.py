@@ -16,6 +16,7 @@ setup(
     extras_require={
         'curses_core': ['curses'],
         'pygame_core': ['pygame'],
+        'numpy': ['numpy'],
     },
     license='GPLv2+',
     classifiers=[
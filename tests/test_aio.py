@@ -0,0 +1,97 @@
+from __future__ import absolute_import
+
+import os
+import select
+import sys
+import time
+import unittest
+
+from dirtywords.base import Screen
+from dirtywords.base import Window
+
+try:
+    import asyncio
+    from dirtywords import aio
+except (ImportError, SyntaxError):
+    aio = None
+
+
+class PipeScreen(Screen):
+    def __init__(self, height, width):
+        super(PipeScreen, self).__init__(height, width)
+        self.r, self.w = os.pipe()
+        self.flushes = 0
+
+    def fileno(self):
+        return self.r
+
+    def getch(self, blocking=True):
+        timeout = None if blocking else self.input_timeout
+        if select.select([self.r], [], [], timeout)[0]:
+            return ord(os.read(self.r, 1))
+
+    def _flush(self, damage):
+        self.flushes += 1
+
+    def cleanup(self):
+        os.close(self.r)
+        os.close(self.w)
+
+
+# coroutines are driven with run_until_complete so that this module can
+# still be imported on Python 2
+@unittest.skipIf(aio is None or sys.platform == 'win32', 'asyncio n/a')
+class TestAio(unittest.TestCase):
+    def setUp(self):
+        self.scr = PipeScreen(2, 2)
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self.loop.close()
+        self.scr.cleanup()
+
+    def run_async(self, coro, timeout=2):
+        return self.loop.run_until_complete(asyncio.wait_for(coro, timeout))
+
+    def test_getch(self):
+        self.loop.call_later(0.01, os.write, self.scr.w, b'ab')
+        self.assertEqual(self.run_async(aio.getch(self.scr)), ord('a'))
+        self.assertEqual(self.run_async(aio.getch(self.scr)), ord('b'))
+        self.assertEqual(self.scr.input_timeout, 0.1)
+
+    def test_key_events(self):
+        self.loop.call_later(0.01, os.write, self.scr.w, b'a')
+        events = aio.key_events(self.scr)
+        event = self.run_async(events.__anext__())
+        self.assertEqual((event['type'], event['key']), ('keydown', 97))
+        event = self.run_async(events.__anext__())
+        self.assertEqual((event['type'], event['key']), ('keyup', 97))
+        self.run_async(events.aclose())
+
+    def test_keyup_deadline(self):
+        self.scr.key_release_timeout = 0.3
+        os.write(self.scr.w, b'aa')
+        events = aio.key_events(self.scr)
+        event = self.run_async(events.__anext__())
+        self.assertEqual((event['type'], event['key']), ('keydown', 97))
+
+        # the key was pressed 0.2s ago, so it is released after 0.1s
+        time.sleep(0.2)
+        start = time.time()
+        event = self.run_async(events.__anext__())
+        self.assertEqual((event['type'], event['key']), ('keyup', 97))
+        self.assertLess(time.time() - start, 0.2)
+        self.run_async(events.aclose())
+
+    def test_pending_frame_of_window(self):
+        self.scr.max_fps = 1
+        self.scr.refresh()
+        win = Window(self.scr, 1, 1, 0, 0)
+        win.putstr(0, 0, 'x')
+        win.refresh()
+        self.assertEqual(self.scr.flushes, 1)
+
+        self.loop.call_later(0.01, os.write, self.scr.w, b'a')
+        self.assertEqual(self.run_async(aio.getch(win)), ord('a'))
+        self.assertEqual(self.scr.flushes, 2)
+        self.assertEqual(self.scr.data.text(0), 'x ')
@@ -0,0 +1,79 @@
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import unittest
+
+from dirtywords import ansi
+from dirtywords.base import AttrString
+from dirtywords.base import Screen
+from dirtywords.constants import KEYS
+from dirtywords.constants import MODIFIERS
+from dirtywords.style import Style
+
+
+class TestRender(unittest.TestCase):
+    def setUp(self):
+        self.scr = Screen(3, 10)
+        self.scr.pop_dirty()
+
+    def test_only_damage(self):
+        self.scr.putstr(1, 2, 'ab')
+        s = ansi.render(self.scr.data, self.scr.pop_dirty())
+        self.assertEqual(s, '\x1b[2;3H\x1b[0mab\x1b[0m')
+
+    def test_attributes(self):
+        self.scr.putstr(0, 0, AttrString('a', strong=True))
+        self.scr.putstr(0, 1, 'b')
+        s = ansi.render(self.scr.data, self.scr.pop_dirty())
+        self.assertEqual(s, '\x1b[1;1H\x1b[0;1ma\x1b[0mb\x1b[0m')
+
+    def test_colors(self):
+        s = ansi.sgr(Style(fg_color=(255, 0, 0), bg_color=(0, 0, 255)))
+        self.assertEqual(s, '\x1b[0;38;2;255;0;0;48;2;0;0;255m')
+
+    def test_nothing_to_do(self):
+        self.assertEqual(ansi.render(self.scr.data, []), '')
+
+
+class TestKeyDecoder(unittest.TestCase):
+    def setUp(self):
+        self.decoder = ansi.KeyDecoder()
+
+    def test_plain(self):
+        self.assertEqual(self.decoder.feed(b'ab\r\x7f'), [
+            ord('a'), ord('b'), KEYS['Return'], KEYS['Backspace']])
+
+    def test_sequences(self):
+        self.assertEqual(self.decoder.feed(b'\x1b[A\x1bOB\x1b[5~\x1bOP'), [
+            KEYS['Up'], KEYS['Down'], KEYS['PageUp'], KEYS['F1']])
+
+    def test_modifiers(self):
+        self.assertEqual(self.decoder.feed(b'\x1b[1;5A\x1b[3;2~'), [
+            KEYS['Up'] | MODIFIERS['Ctrl'],
+            KEYS['Delete'] | MODIFIERS['Shift'],
+        ])
+        self.assertEqual(self.decoder.feed(b'\x1bx'), [
+            ord('x') | MODIFIERS['Alt']])
+
+    def test_8bit_csi(self):
+        self.assertEqual(self.decoder.feed(b'\x9bA\x9b1;5B'), [
+            KEYS['Up'], KEYS['Down'] | MODIFIERS['Ctrl']])
+        # part of a UTF-8 character
+        self.assertEqual(
+            self.decoder.feed('\u011b'.encode('utf8') + b'A'),
+            [0xc4, 0x9b, ord('A')])
+
+    def test_incremental(self):
+        self.assertEqual(self.decoder.feed(b'\x1b['), [])
+        self.assertTrue(self.decoder.pending)
+        self.assertEqual(self.decoder.feed(b'2'), [])
+        self.assertEqual(self.decoder.feed(b'4~'), [KEYS['F12']])
+        self.assertFalse(self.decoder.pending)
+
+    def test_lone_esc(self):
+        self.assertEqual(self.decoder.feed(b'\x1b'), [])
+        self.assertEqual(self.decoder.flush(), [27])
+        self.assertEqual(self.decoder.feed(b'\x1b\x1b'), [27])
+
+    def test_unknown_csi(self):
+        self.assertEqual(self.decoder.feed(b'\x1b[99;9zq'), [ord('q')])
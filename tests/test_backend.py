@@ -0,0 +1,34 @@
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import os
+import unittest
+
+import dirtywords
+from dirtywords import headless
+from dirtywords import stupid
+
+
+class TestGetBackend(unittest.TestCase):
+    def setUp(self):
+        self.env = os.environ.pop('DIRTYWORDS_BACKEND', None)
+
+    def tearDown(self):
+        if self.env is None:
+            os.environ.pop('DIRTYWORDS_BACKEND', None)
+        else:
+            os.environ['DIRTYWORDS_BACKEND'] = self.env
+
+    def test_name(self):
+        self.assertIs(dirtywords.get_backend('headless'), headless.Screen)
+
+    def test_environment(self):
+        os.environ['DIRTYWORDS_BACKEND'] = 'stupid'
+        self.assertIs(dirtywords.get_backend(), stupid.Screen)
+        self.assertIs(dirtywords.get_backend('headless'), headless.Screen)
+
+    def test_unknown(self):
+        self.assertRaises(ValueError, dirtywords.get_backend, 'foo')
+
+    def test_default(self):
+        self.assertIs(dirtywords.Screen, dirtywords.get_backend())
@@ -0,0 +1,589 @@
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import time
+import unittest
+
+from dirtywords.base import AttrString
+from dirtywords.base import KeyEvent
+from dirtywords.base import Screen
+from dirtywords.base import Window
+from dirtywords.grid import Grid
+from dirtywords.style import DEFAULT
+from dirtywords.style import RichString
+
+
+class DummyScreen(Screen):
+    def __init__(self, height, width):
+        super(DummyScreen, self).__init__(height, width)
+        self.flushes = []
+
+    def _flush(self, damage):
+        self.flushes.append(damage)
+
+
+class TestDamage(unittest.TestCase):
+    def setUp(self):
+        self.scr = Screen(3, 10)
+        self.scr.pop_dirty()
+
+    def test_initially_dirty(self):
+        scr = Screen(2, 4)
+        self.assertEqual(scr.pop_dirty(), [(0, 0, 4), (1, 0, 4)])
+
+    def test_putstr(self):
+        self.scr.putstr(1, 2, 'abc')
+        self.assertEqual(self.scr.pop_dirty(), [(1, 2, 5)])
+        self.assertEqual(self.scr.pop_dirty(), [])
+
+    def test_spans_are_merged(self):
+        self.scr.putstr(1, 2, 'a')
+        self.scr.putstr(1, 6, 'b')
+        self.assertEqual(self.scr.pop_dirty(), [(1, 2, 7)])
+
+    def test_unchanged_is_noop(self):
+        self.scr.putstr(0, 0, 'ab')
+        self.scr.pop_dirty()
+        self.scr.putstr(0, 0, 'ab')
+        self.assertEqual(self.scr.pop_dirty(), [])
+        self.scr.putstr(0, 0, 'xb')
+        self.assertEqual(self.scr.pop_dirty(), [(0, 0, 1)])
+
+    def test_changed_attrs(self):
+        self.scr.putstr(0, 0, 'a')
+        self.scr.pop_dirty()
+        self.scr.putstr(0, 0, AttrString('a', strong=True))
+        self.assertEqual(self.scr.pop_dirty(), [(0, 0, 1)])
+
+    def test_clipping(self):
+        self.scr.putstr(0, 8, 'abc')
+        self.scr.putstr(0, -1, 'xy')
+        self.scr.putstr(5, 0, 'abc')
+        self.scr.putstr(0, 12, 'abcdef')
+        self.scr.putstr(2, 10, 'abc')
+        self.assertEqual(self.scr.pop_dirty(), [(0, 0, 10)])
+        self.assertEqual(self.scr.data[0][0], 'y')
+        self.assertEqual(self.scr.data[0][9], 'b')
+        self.assertEqual(self.scr.data.text(1), ' ' * 10)
+
+
+class ScrollScreen(DummyScreen):
+    native_scroll = True
+
+    def __init__(self, height, width):
+        super(ScrollScreen, self).__init__(height, width)
+        self.scrolls = []
+
+    def _scroll(self, n, top, bottom):
+        self.scrolls.append((n, top, bottom))
+
+
+class TestScroll(unittest.TestCase):
+    def setUp(self):
+        self.scr = ScrollScreen(4, 3)
+        for y in range(4):
+            self.scr.putstr(y, 0, str(y) * 3)
+        self.scr.refresh()
+
+    def lines(self):
+        return [self.scr.data.text(y) for y in range(4)]
+
+    def test_native(self):
+        self.scr.scroll(1)
+        self.assertEqual(self.lines(), ['111', '222', '333', '   '])
+        self.scr.refresh()
+        self.assertEqual(self.scr.scrolls, [(1, 0, 4)])
+        self.assertEqual(self.scr.flushes[-1], [(3, 0, 3)])
+
+    def test_region(self):
+        self.scr.putstr(2, 1, 'x')
+        self.scr.putstr(3, 1, 'x')
+        self.scr.scroll(-1, 1, 3)
+        self.assertEqual(self.lines(), ['000', '   ', '111', '3x3'])
+        self.scr.refresh()
+        self.assertEqual(self.scr.scrolls, [(-1, 1, 3)])
+        self.assertEqual(self.scr.flushes[-1], [(1, 0, 3), (3, 1, 2)])
+
+    def test_not_native(self):
+        self.scr.native_scroll = False
+        self.scr.putstr(0, 0, 'x')
+        self.scr.scroll(2, 1)
+        self.scr.refresh()
+        self.assertEqual(self.scr.scrolls, [])
+        self.assertEqual(self.scr.flushes[-1], [
+            (0, 0, 1), (1, 0, 3), (2, 0, 3), (3, 0, 3)])
+
+    def test_window(self):
+        win = Window(self.scr, 1, 1, 1, 1)
+        win.putstr(0, 0, 'w')
+        self.scr.refresh()
+        self.scr.scroll(1)
+        self.scr.refresh()
+        self.assertEqual(self.lines(), ['1 1', '2w2', '333', '   '])
+        self.assertEqual(
+            self.scr.flushes[-1], [(0, 1, 2), (1, 1, 2), (3, 0, 3)])
+
+
+class TestBlit(unittest.TestCase):
+    def setUp(self):
+        self.scr = Screen(3, 4)
+        self.scr.pop_dirty()
+
+    def test_rows(self):
+        self.scr.blit(1, 1, ['ab', 'cd', 'ef'])
+        self.assertEqual(self.scr.data.text(1), ' ab ')
+        self.assertEqual(self.scr.data.text(2), ' cd ')
+        self.assertEqual(self.scr.pop_dirty(), [(1, 1, 3), (2, 1, 3)])
+
+    def test_source_rect(self):
+        self.scr.blit(-1, 0, ['abc', 'def', 'ghi'], height=2, width=1, sx=1)
+        self.assertEqual(self.scr.data.text(0), 'e   ')
+        self.assertEqual(self.scr.pop_dirty(), [(0, 0, 1)])
+
+    def test_screen(self):
+        src = Screen(2, 2)
+        src.putstr(0, 0, AttrString('ab', strong=True))
+        src.putstr(1, 0, 'cd')
+        self.scr.blit(2, 3, src)
+        self.assertEqual(self.scr.data[2][3], AttrString('a', strong=True))
+        self.assertTrue(self.scr.data[2][3].strong)
+        self.assertEqual(self.scr.pop_dirty(), [(2, 3, 4)])
+
+    def test_buffer(self):
+        self.scr.blit(0, 0, memoryview(b'abcdef').cast('B', (2, 3)))
+        self.assertEqual(self.scr.data.text(0), 'abc ')
+        self.assertEqual(self.scr.data.text(1), 'def ')
+        self.assertRaises(ValueError, self.scr.blit, 0, 0, b'abc')
+
+    def test_fill_column(self):
+        self.scr.fill_column(2, '|')
+        self.assertEqual(self.scr.data.text(1), '  | ')
+        self.assertEqual(len(self.scr.pop_dirty()), 3)
+
+    def test_styled_border(self):
+        self.scr.border(ls=AttrString('|', strong=True),
+                        ts=AttrString('-', strong=True))
+        self.assertEqual(self.scr.data.text(0), '+--+')
+        self.assertTrue(self.scr.data[0][1].strong)
+        self.assertTrue(self.scr.data[1][0].strong)
+        self.assertNotIsInstance(self.scr.data[2][1], AttrString)
+        self.assertNotIsInstance(self.scr.data[0][0], AttrString)
+
+
+class TestAttrString(unittest.TestCase):
+    def test_attrs(self):
+        s = AttrString('ab', strong=True, fg_color=(0, 255, 0))
+        self.assertTrue(s.strong)
+        self.assertFalse(s.emph)
+        self.assertEqual(s.fg_color, (0, 255, 0))
+
+    def test_invalid_attr(self):
+        self.assertRaises(TypeError, AttrString, 'a', foo=True)
+
+    def test_shared_style(self):
+        a = AttrString('ab', strong=True)
+        b = AttrString('cd', strong=True)
+        self.assertIs(a.style, b.style)
+        self.assertIs(AttrString(a).style, a.style)
+        self.assertIsNot(AttrString(a, emph=True).style, a.style)
+
+    def test_iter(self):
+        s = AttrString('aba', underline=True)
+        chars = list(s)
+        self.assertEqual(chars, ['a', 'b', 'a'])
+        self.assertTrue(all(ch.underline for ch in chars))
+        self.assertIs(chars[0].style, chars[2].style)
+
+    def test_getitem(self):
+        s = AttrString('abc', emph=True)
+        self.assertTrue(s[1].emph)
+        self.assertEqual(s[1:], 'bc')
+        self.assertTrue(s[1:].emph)
+
+    def test_set_attrs(self):
+        s = AttrString('aa', fg_color=(0, 255, 0))
+        ch = s[0]
+        ch.set_attrs(strong=True)
+        self.assertTrue(ch.strong)
+        self.assertEqual(ch.fg_color, (255, 255, 255))
+        ch.set_attrs(s, emph=True)
+        self.assertEqual(ch.fg_color, (0, 255, 0))
+        self.assertFalse(s[0].strong)
+        self.assertFalse(s.emph)
+
+    def test_setters(self):
+        s = AttrString('a')
+        t = AttrString('a')
+        s.strong = True
+        s.fg_color = (0, 0, 255)
+        self.assertTrue(s.strong)
+        self.assertEqual(s.fg_color, (0, 0, 255))
+        self.assertFalse(t.strong)
+        self.assertIs(t.style, DEFAULT)
+
+    def test_style_is_immutable(self):
+        s = AttrString('a')
+        self.assertRaises(AttributeError, setattr, s.style, 'strong', True)
+
+
+class TestRichString(unittest.TestCase):
+    def setUp(self):
+        self.s = (AttrString('ab', strong=True) + 'cd' +
+                  AttrString('ef', emph=True))
+
+    def spans(self, s):
+        return [(n, style.strong, style.emph) for n, style in s.spans]
+
+    def test_concat(self):
+        self.assertIsInstance(self.s, RichString)
+        self.assertEqual(self.s, 'abcdef')
+        self.assertEqual(self.spans(self.s), [
+            (2, True, False), (2, False, False), (2, False, True)])
+        self.assertEqual(self.spans('x' + self.s)[0], (1, False, False))
+        self.assertEqual(self.spans(self.s + self.s[:2]), [
+            (2, True, False), (2, False, False), (2, False, True),
+            (2, True, False)])
+
+    def test_merge(self):
+        s = AttrString('a', strong=True) + AttrString('b', strong=True)
+        self.assertEqual(self.spans(s), [(2, True, False)])
+
+    def test_slice(self):
+        self.assertEqual(self.spans(self.s[1:5]), [
+            (1, True, False), (2, False, False), (1, False, True)])
+        self.assertEqual(self.spans(self.s[::2]), [
+            (1, True, False), (1, False, False), (1, False, True)])
+        self.assertEqual(self.s[4:], 'ef')
+
+    def test_chars(self):
+        self.assertTrue(self.s[1].strong)
+        self.assertTrue(self.s[-1].emph)
+        self.assertEqual([ch.strong for ch in self.s[:3]], [True, True, False])
+
+    def test_invalid_spans(self):
+        self.assertRaises(ValueError, RichString, 'ab', [(1, DEFAULT)])
+
+    def test_putstr(self):
+        scr = Screen(1, 8)
+        scr.pop_dirty()
+        scr.putstr(0, 1, self.s)
+        self.assertEqual(scr.data.text(0), ' abcdef ')
+        self.assertTrue(scr.data[0][2].strong)
+        self.assertFalse(isinstance(scr.data[0][3], AttrString))
+        self.assertTrue(scr.data[0][6].emph)
+        self.assertEqual(
+            [text for x, text, style in scr.data.runs(0)],
+            [' ', 'ab', 'cd', 'ef', ' '])
+        self.assertEqual(scr.pop_dirty(), [(0, 1, 7)])
+
+
+class TestGrid(unittest.TestCase):
+    grid_class = Grid
+
+    def setUp(self):
+        self.grid = self.grid_class(3, 5)
+
+    def test_initial(self):
+        self.assertEqual(self.grid.text(0), '     ')
+        self.assertEqual(self.grid[2][4], ' ')
+
+    def test_put(self):
+        self.assertEqual(self.grid.put(1, 1, 'abc'), (1, 4))
+        self.assertEqual(self.grid.text(1), ' abc ')
+        self.assertEqual(self.grid.put(1, 1, 'abx'), (3, 4))
+        self.assertEqual(self.grid.put(1, 1, 'abx'), None)
+
+    def test_style(self):
+        self.grid.put(0, 0, AttrString('ab', strong=True))
+        self.assertTrue(self.grid[0][1].strong)
+        self.assertEqual(self.grid.put(0, 0, 'ab'), (0, 2))
+        self.assertFalse(isinstance(self.grid[0][0], AttrString))
+
+    def test_list_compat(self):
+        self.grid[0][2] = 'x'
+        self.assertEqual(self.grid[0][2], 'x')
+        self.assertEqual(self.grid[0][-3], 'x')
+        self.assertEqual(''.join(self.grid[0]), '  x  ')
+        self.assertEqual(len(self.grid), 3)
+        self.assertEqual(len(self.grid[0]), 5)
+        self.assertRaises(IndexError, lambda: self.grid[3])
+
+    def test_fill_and_copy(self):
+        self.grid.fill('#')
+        copy = self.grid.copy()
+        self.grid.put(0, 0, 'a')
+        self.assertEqual(copy.text(0), '#####')
+        self.assertEqual(self.grid.text(0), 'a####')
+
+    def test_runs(self):
+        self.grid.put(0, 1, AttrString('ab', strong=True))
+        runs = [(x, text, style.strong)
+                for x, text, style in self.grid.runs(0, 0, 4)]
+        self.assertEqual(runs, [(0, ' ', False), (1, 'ab', True),
+                                (3, ' ', False)])
+
+    def test_put_rich(self):
+        s = AttrString('abcdefghij', strong=True) + 'k'
+        self.assertEqual(self.grid.put(0, -7, s), (0, 4))
+        self.assertEqual(self.grid.text(0), 'hijk ')
+        self.assertTrue(self.grid[0][2].strong)
+        self.assertFalse(isinstance(self.grid[0][3], AttrString))
+
+    def test_clipping(self):
+        self.assertEqual(self.grid.put(0, 3, 'abc'), (3, 5))
+        self.assertEqual(self.grid.put(0, 5, 'abc'), None)
+        self.assertEqual(self.grid.put(0, 7, 'abcdef'), None)
+        self.assertEqual(self.grid.put(2, 7, 'abcdef'), None)
+        self.assertEqual(self.grid.put(3, 0, 'abc'), None)
+        self.assertEqual(self.grid.text(0), '   ab')
+        self.assertEqual(self.grid.text(1), '     ')
+
+    def test_fill_rect(self):
+        spans = self.grid.fill_rect(1, 3, 5, 5, '#')
+        self.assertEqual(spans, [(1, 3, 5), (2, 3, 5)])
+        self.assertEqual(self.grid.text(2), '   ##')
+        self.assertEqual(self.grid.fill_rect(1, 3, 5, 5, '#'), [])
+
+    def test_copy_rect(self):
+        src = Grid(2, 2)
+        src.put(0, 0, 'ab')
+        src.put(1, 0, AttrString('cd', strong=True))
+        spans = self.grid.copy_rect(src, 0, 0, 1, 4, 2, 2)
+        self.assertEqual(spans, [(1, 4, 5), (2, 4, 5)])
+        self.assertEqual(self.grid.text(1), '    a')
+        self.assertEqual(self.grid.text(2), '    c')
+        self.assertTrue(self.grid[2][4].strong)
+
+    def test_copy_rect_overlap(self):
+        for y in range(3):
+            self.grid.put(y, 0, str(y) * 5)
+        self.grid.copy_rect(self.grid, 0, 0, 1, 1, 2, 4)
+        self.assertEqual(
+            [self.grid.text(y) for y in range(3)],
+            ['00000', '10000', '21111'])
+
+    def test_scroll(self):
+        for y in range(3):
+            self.grid.put(y, 0, str(y) * 5)
+        self.grid.scroll(1, 0, 2)
+        self.assertEqual(
+            [self.grid.text(y) for y in range(3)],
+            ['11111', '     ', '22222'])
+        self.grid.scroll(-1)
+        self.assertEqual(
+            [self.grid.text(y) for y in range(3)],
+            ['     ', '11111', '     '])
+
+    def test_diff(self):
+        other = self.grid.copy()
+        self.assertEqual(self.grid.diff(other), [])
+        other.put(1, 1, 'a')
+        other.put(1, 3, 'b')
+        self.assertEqual(self.grid.diff(other), [(1, 1, 4)])
+        self.assertEqual(self.grid.diff(Grid(3, 5)), [])
+
+
+class TestCompositor(unittest.TestCase):
+    def setUp(self):
+        self.scr = DummyScreen(5, 10)
+        self.scr.refresh()
+        self.scr.flushes = []
+
+    def test_single_flush(self):
+        a = Window(self.scr, 2, 3, 0, 0)
+        b = Window(self.scr, 2, 3, 3, 5)
+        a.putstr(0, 0, 'a')
+        b.putstr(1, 2, 'b')
+        self.scr.refresh()
+        self.assertEqual(self.scr.flushes, [[(0, 0, 1), (4, 7, 8)]])
+        self.assertEqual(self.scr.data.text(4), '       b  ')
+
+    def test_only_changes(self):
+        win = Window(self.scr, 2, 3, 1, 1)
+        win.refresh()
+        win.putstr(1, 1, 'x')
+        win.refresh()
+        self.assertEqual(self.scr.flushes[-1], [(2, 2, 3)])
+
+    def test_overlap(self):
+        low = Window(self.scr, 1, 6, 0, 0)
+        Window(self.scr, 1, 2, 0, 2, z=1)
+        low.putstr(0, 0, 'abcdef')
+        self.scr.refresh()
+        self.assertEqual(self.scr.data.text(0), 'ab  ef    ')
+
+    def test_restore_after_parent_draw(self):
+        win = Window(self.scr, 1, 2, 0, 0)
+        win.putstr(0, 0, 'ab')
+        self.scr.refresh()
+        self.scr.fill_row(0, '-')
+        self.scr.refresh()
+        self.assertEqual(self.scr.data.text(0), 'ab--------')
+
+    def test_close(self):
+        low = Window(self.scr, 1, 6, 0, 0)
+        high = Window(self.scr, 2, 2, 0, 2, z=1)
+        low.putstr(0, 0, 'abcdef')
+        high.fill('x')
+        self.scr.refresh()
+        self.assertEqual(self.scr.data.text(1), '  xx      ')
+        high.close()
+        self.scr.refresh()
+        self.assertEqual(self.scr.flushes[-1], [(0, 2, 4), (1, 2, 4)])
+        self.assertEqual(self.scr.data.text(0), 'abcdef    ')
+        self.assertEqual(self.scr.data.text(1), '          ')
+
+    def test_nested(self):
+        outer = Window(self.scr, 3, 5, 1, 1)
+        inner = Window(outer, 1, 2, 1, 1)
+        inner.putstr(0, 0, 'xy')
+        inner.refresh()
+        self.assertEqual(self.scr.data.text(2), '  xy      ')
+        self.assertEqual(len(self.scr.flushes), 1)
+
+
+class TestFramePacing(unittest.TestCase):
+    def setUp(self):
+        self.scr = DummyScreen(2, 2)
+        self.scr.max_fps = 1
+
+    def test_coalesce(self):
+        self.scr.refresh()
+        self.scr.putstr(0, 0, 'a')
+        self.scr.refresh()
+        self.scr.putstr(0, 1, 'b')
+        self.scr.refresh()
+        self.assertEqual(len(self.scr.flushes), 1)
+        self.assertEqual(self.scr.merged_frames, 2)
+
+        self.scr.refresh_pending()
+        self.assertEqual(len(self.scr.flushes), 1)
+
+        self.scr.refresh_pending(force=True)
+        self.assertEqual(self.scr.flushes[-1], [(0, 0, 2)])
+        self.assertEqual(self.scr.frames, 2)
+        self.assertEqual(self.scr.merged_frames, 1)
+
+    def test_unlimited(self):
+        self.scr.max_fps = None
+        self.scr.refresh()
+        self.scr.refresh()
+        self.assertEqual(self.scr.frames, 2)
+        self.assertEqual(self.scr.merged_frames, 0)
+
+
+class TestFrameStats(unittest.TestCase):
+    def setUp(self):
+        self.scr = QueueScreen(2, 4)
+        self.scr.refresh()
+        self.collected = []
+        self.scr.enable_stats(self.collected.append)
+
+    def test_disabled_by_default(self):
+        scr = DummyScreen(1, 1)
+        self.assertEqual(scr.stats, None)
+        self.assertNotIn('putstr', scr.__dict__)
+
+    def test_frame(self):
+        self.scr.putstr(0, 0, 'ab')
+        self.scr.putstr(0, 0, 'ab')
+        self.scr.putstr(1, 1, 'c')
+        self.scr.refresh()
+        stats = self.scr.last_stats
+        self.assertEqual(self.collected, [stats])
+        self.assertEqual(stats.frame, 2)
+        self.assertEqual(stats.cells_written, 5)
+        self.assertEqual(stats.cells_changed, 3)
+        self.assertEqual(stats.input_latency, None)
+        self.assertTrue(stats.refresh_time >= 0)
+        self.assertEqual(self.scr.stats.cells_written, 0)
+
+    def test_blit(self):
+        self.scr.blit(0, 0, ['ab', 'cd'])
+        self.scr.refresh()
+        self.assertEqual(self.scr.last_stats.cells_written, 4)
+
+    def test_input_latency(self):
+        self.scr.input = [97, 98]
+        self.scr.getch()
+        self.scr.getch()
+        self.scr.refresh()
+        self.assertTrue(self.scr.last_stats.input_latency >= 0)
+        self.scr.refresh()
+        self.assertEqual(self.scr.last_stats.input_latency, None)
+
+    def test_window(self):
+        win = Window(self.scr, 1, 2, 1, 1)
+        win.putstr(0, 0, 'ab')
+        win.blit(0, 0, ['x'])
+        win.refresh()
+        self.assertEqual(self.scr.last_stats.cells_written, 3)
+        self.assertEqual(self.scr.last_stats.cells_changed, 2)
+
+    def test_key_events_latency(self):
+        # like pygame, which does not use getch for key events
+        class EventScreen(DummyScreen):
+            def get_key_events(self):
+                yield KeyEvent('keydown', 97)
+
+        scr = EventScreen(1, 1)
+        scr.enable_stats()
+        self.assertEqual(len(list(scr.get_key_events())), 1)
+        scr.refresh()
+        self.assertTrue(scr.last_stats.input_latency >= 0)
+
+    def test_disable(self):
+        self.scr.disable_stats()
+        self.scr.putstr(0, 0, 'a')
+        self.scr.refresh()
+        self.assertEqual(self.collected, [])
+        self.assertEqual(self.scr.flushes[-1], [(0, 0, 1)])
+
+
+class QueueScreen(DummyScreen):
+    def __init__(self, height, width):
+        super(QueueScreen, self).__init__(height, width)
+        self.input = []
+
+    def getch(self, blocking=True):
+        if self.input:
+            return self.input.pop(0)
+
+
+class TestKeyEvents(unittest.TestCase):
+    def setUp(self):
+        self.scr = QueueScreen(1, 1)
+        self.scr.key_release_timeout = 0.01
+
+    def events(self):
+        return [(e['type'], e.key) for e in self.scr.get_key_events()]
+
+    def test_single_press(self):
+        self.scr.input = [97]
+        self.assertEqual(self.events(), [('keydown', 97)])
+        self.assertEqual(self.events(), [('keyup', 97)])
+        time.sleep(0.02)
+        self.assertEqual(self.events(), [])
+        self.assertEqual(self.scr._pressed_keys, {})
+
+    def test_drains_all_input(self):
+        self.scr.input = [97, 98]
+        self.assertEqual(self.events(), [('keydown', 97), ('keydown', 98)])
+
+    def test_held_key(self):
+        self.scr.input = [97]
+        self.assertEqual(self.events(), [('keydown', 97)])
+        self.assertEqual(self.events(), [('keyup', 97)])
+        self.scr.input = [97]
+        self.assertEqual(self.events(), [('keydown', 97)])
+        self.scr.input = [97]
+        self.assertEqual(self.events(), [])
+        time.sleep(0.02)
+        self.assertEqual(self.events(), [('keyup', 97)])
+
+    def test_event_compat(self):
+        self.scr.input = [97]
+        event = next(self.scr.get_key_events())
+        self.assertEqual(event['key'], 97)
+        self.assertEqual(event.get('modifier'), None)
+        self.assertRaises(KeyError, lambda: event['foo'])
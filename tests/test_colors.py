@@ -0,0 +1,26 @@
+from __future__ import absolute_import
+
+import unittest
+
+from dirtywords.colors import quantize
+
+
+class TestQuantize(unittest.TestCase):
+    def test_basic(self):
+        self.assertEqual(quantize((0, 0, 0), 8), 0)
+        self.assertEqual(quantize((255, 0, 0), 8), 1)
+        self.assertEqual(quantize((0, 255, 0), 8), 2)
+        self.assertEqual(quantize((0, 0, 255), 8), 4)
+        self.assertEqual(quantize((255, 255, 255), 8), 7)
+
+    def test_16(self):
+        self.assertEqual(quantize((250, 0, 0), 16), 9)
+        self.assertEqual(quantize((200, 0, 0), 16), 1)
+
+    def test_256(self):
+        self.assertEqual(quantize((255, 0, 0), 256), 196)
+        self.assertEqual(quantize((0, 0, 0), 256), 16)
+        self.assertEqual(quantize((128, 128, 128), 256), 244)
+
+    def test_truecolor(self):
+        self.assertEqual(quantize((1, 2, 3), 2 ** 24), 0x010203)
@@ -2,9 +2,13 @@ from __future__ import absolute_import
 
 import unittest
 
+from dirtywords.base import AttrString
+
 from . import shared_core
 
 try:
+    from dirtywords import base
+    from dirtywords.curses import ColorPairs
     from dirtywords.curses import Screen
     from dirtywords.curses import curses
 except ImportError:
@@ -26,3 +30,79 @@ class TestCurses(shared_core.TestCore):
     def tearDown(self):
         self.scr.cleanup()
         super(TestCurses, self).tearDown()
+
+
+if curses is not None:
+    class _ColorPairs(ColorPairs):
+        def __init__(self, size):
+            super(_ColorPairs, self).__init__(size)
+            self.defined = {}
+
+        def _init_pair(self, pair, fg, bg):
+            self.defined[pair] = (fg, bg)
+
+    class _Window(object):
+        def refresh(self):
+            pass
+
+    class _Screen(Screen):
+        # draws into a list instead of a curses window
+        def __init__(self, height, width, pairs):
+            base.Screen.__init__(self, height, width)
+            self.color_pairs = _ColorPairs(pairs)
+            self.curses_window = _Window()
+            self.drawn = []
+
+        def _get_color(self, color):
+            return color
+
+        def _draw_run(self, y, x, text, style):
+            pair = self.color_pairs.get(*self._get_colors(style))
+            self.drawn.append((y, x, text, pair))
+
+
+@unittest.skipIf(curses is None, 'curses not available')
+class TestColorPairs(unittest.TestCase):
+    def test_allocate(self):
+        pairs = _ColorPairs(8)
+        self.assertEqual(pairs.get(1, 2), 1)
+        self.assertEqual(pairs.get(3, 4), 2)
+        self.assertEqual(pairs.get(1, 2), 1)
+        self.assertEqual(pairs.defined, {1: (1, 2), 2: (3, 4)})
+
+    def test_no_colors(self):
+        pairs = _ColorPairs(0)
+        self.assertEqual(pairs.get(1, 2), 0)
+        self.assertEqual(pairs.defined, {})
+
+    def test_cap(self):
+        pairs = _ColorPairs(65536)
+        self.assertEqual(pairs.size, curses.A_COLOR >> 8)
+        numbers = [pairs.get(fg, 0) for fg in range(pairs.size + 5)]
+        self.assertEqual(numbers[:pairs.size], list(range(1, pairs.size + 1)))
+        # least recently used pairs are redefined
+        self.assertEqual(numbers[pairs.size:], [1, 2, 3, 4, 5])
+        self.assertEqual(pairs.defined[1], (pairs.size, 0))
+        self.assertEqual(
+            pairs.pop_redefined(), [(fg, 0) for fg in range(5)])
+        self.assertEqual(pairs.pop_redefined(), [])
+
+    def test_redraw_redefined(self):
+        red = AttrString('r', fg_color=(255, 0, 0))
+        green = AttrString('g', fg_color=(0, 255, 0))
+        blue = AttrString('b', fg_color=(0, 0, 255))
+
+        scr = _Screen(2, 4, 4)
+        scr.putstr(0, 0, red)
+        scr.putstr(0, 1, green)
+        scr.refresh()
+        scr.putstr(0, 1, ' ')
+        scr.putstr(1, 0, blue)
+        scr.drawn = []
+        scr.refresh()
+
+        # blue took the pair of red, which is still on screen
+        y, x, text, pair = scr.drawn[-1]
+        self.assertEqual((y, x, text), (0, 0, 'r'))
+        self.assertEqual(scr.color_pairs.defined[pair][0], (255, 0, 0))
+        self.assertEqual(scr.pop_dirty(), [])
@@ -0,0 +1,115 @@
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import unittest
+
+from dirtywords.base import AttrString
+from dirtywords.base import Window
+from dirtywords.constants import KEYS
+from dirtywords.headless import Screen
+from dirtywords.headless import VirtualTerminal
+
+
+class TestVirtualTerminal(unittest.TestCase):
+    def setUp(self):
+        self.term = VirtualTerminal(3, 5)
+
+    def test_text(self):
+        self.term.feed('ab\r\ncd')
+        self.assertEqual(self.term.lines(), ['ab   ', 'cd   ', '     '])
+
+    def test_wrap_and_scroll(self):
+        self.term.feed('\x1b[3;4Habcd')
+        self.assertEqual(self.term.lines(), ['     ', '   ab', 'cd   '])
+
+    def test_cursor_and_erase(self):
+        self.term.feed('xxxxx\x1b[1;2H\x1b[K\x1b[2;1Hy')
+        self.assertEqual(self.term.lines(), ['x    ', 'y    ', '     '])
+
+    def test_sgr(self):
+        self.term.feed('\x1b[1;38;2;255;0;0ma\x1b[0mb')
+        a = self.term.data[0][0]
+        self.assertTrue(a.strong)
+        self.assertEqual(a.fg_color, (255, 0, 0))
+        self.assertFalse(isinstance(self.term.data[0][1], AttrString))
+
+    def test_partial_sequence(self):
+        self.term.feed('\x1b[2')
+        self.term.feed(';2Hx')
+        self.assertEqual(self.term.lines()[1], ' x   ')
+
+    def test_invalid_sequence(self):
+        self.term.feed('\x1b[12\x01a')
+        self.term.feed('\x1b[' + '1' * 100)
+        self.term.feed('b')
+        self.assertEqual(self.term.lines()[0], 'ab   ')
+
+    def test_scroll_region(self):
+        self.term.feed('a\r\nb\r\nc\x1b[2;3r\x1b[1S')
+        self.assertEqual(self.term.lines(), ['a    ', 'c    ', '     '])
+
+    def test_alternate_screen(self):
+        self.term.feed('a\x1b[?1049hb\x1b[?1049l')
+        self.assertEqual(self.term.lines()[0], 'a    ')
+
+
+class TestHeadlessScreen(unittest.TestCase):
+    def test_render(self):
+        scr = Screen(3, 6)
+        scr.border()
+        scr.putstr(1, 1, 'hi')
+        scr.refresh()
+        self.assertEqual(scr.terminal.lines(), ['+----+', '|hi  |', '+----+'])
+
+    def test_render_ansi(self):
+        scr = Screen(3, 6, ansi=True)
+        win = Window(scr, 1, 4, 1, 1)
+        win.putstr(0, 0, AttrString('hi', strong=True))
+        scr.refresh()
+        win.putstr(0, 0, 'ho')
+        scr.refresh()
+        self.assertEqual(scr.terminal.lines()[1], ' ho   ')
+        self.assertEqual(scr.terminal.data.text(1), scr.data.text(1))
+        self.assertEqual(len(scr.output), 2)
+
+    def test_scroll(self):
+        for ansi in [False, True]:
+            scr = Screen(4, 3, ansi=ansi)
+            for y in range(4):
+                scr.putstr(y, 0, str(y) * 3)
+            scr.refresh()
+            scr.scroll(1, 1, 3)
+            scr.putstr(2, 0, 'x')
+            scr.refresh()
+            self.assertEqual(
+                scr.terminal.lines(), ['000', '222', 'x  ', '333'])
+
+    def test_scroll_output(self):
+        scr = Screen(60, 10, ansi=True)
+        scr.refresh()
+        scr.putstr(59, 0, 'a' * 10)
+        scr.refresh()
+        scr.scroll(1)
+        scr.putstr(59, 0, 'b' * 10)
+        scr.refresh()
+        self.assertEqual(scr.terminal.lines()[58:], ['a' * 10, 'b' * 10])
+        self.assertEqual(scr.output[-1].count('b' * 10), 1)
+        self.assertTrue(len(''.join(scr.output[-2:])) < 40)
+
+    def test_stats_output(self):
+        scr = Screen(2, 6, ansi=True)
+        scr.enable_stats()
+        scr.putstr(0, 0, 'hi')
+        scr.refresh()
+        self.assertEqual(
+            scr.last_stats.output, len(scr.output[0].encode('utf8')))
+
+    def test_input(self):
+        scr = Screen(1, 1)
+        scr.feed_input('a\x1b[A\x1b')
+        self.assertEqual(scr.getch(), ord('a'))
+        self.assertEqual(scr.getch(), KEYS['Up'])
+        self.assertEqual(scr.getch(), 27)
+        self.assertEqual(scr.getch(blocking=False), None)
+        self.assertRaises(EOFError, scr.getch)
+        self.assertRaises(EOFError, scr.getkey)
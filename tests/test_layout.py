@@ -0,0 +1,86 @@
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import unittest
+
+from dirtywords.base import AttrString
+from dirtywords.headless import Screen
+from dirtywords.layout import TextView
+from dirtywords.layout import break_lines
+
+
+class TestBreakLines(unittest.TestCase):
+    def lines(self, s, width):
+        return [s[start:end] for start, end in break_lines(s, width)]
+
+    def test_words(self):
+        self.assertEqual(
+            self.lines('foo bar baz', 7), ['foo bar', 'baz'])
+        self.assertEqual(self.lines('foo bar', 3), ['foo', 'bar'])
+
+    def test_long_word(self):
+        self.assertEqual(self.lines('abcdefg h', 3), ['abc', 'def', 'g h'])
+
+    def test_empty(self):
+        self.assertEqual(break_lines('', 5), [(0, 0)])
+
+
+class TestTextView(unittest.TestCase):
+    def setUp(self):
+        self.scr = Screen(4, 8)
+        self.view = TextView(self.scr, 3, 6, 1, 1)
+
+    def lines(self):
+        self.scr.refresh()
+        return [line[1:7] for line in self.scr.terminal.lines()[1:]]
+
+    def test_wrap(self):
+        self.view.append('hello world')
+        self.view.append(AttrString('ok', strong=True))
+        self.assertEqual(self.lines(), ['hello ', 'world ', 'ok    '])
+        self.assertTrue(self.scr.terminal.data[3][1].strong)
+
+    def test_truncate(self):
+        self.view.wrap = False
+        self.view.append('hello world')
+        self.assertEqual(self.lines(), ['hello ', '      ', '      '])
+
+    def test_follow(self):
+        self.view.extend(str(i) for i in range(10))
+        self.assertEqual(self.lines(), ['7     ', '8     ', '9     '])
+        self.view.scroll_to(1)
+        self.assertEqual(self.lines(), ['1     ', '2     ', '3     '])
+
+    def test_append_one_by_one(self):
+        for i in range(5):
+            self.view.append('%i %i' % (i, i))
+            self.lines()
+        self.view.append('x')
+        self.assertEqual(self.lines(), ['3 3   ', '4 4   ', 'x     '])
+        self.view.clear_paragraphs()
+        self.assertEqual(self.lines(), ['      '] * 3)
+
+    def test_clear(self):
+        self.view.extend(['a', 'b'])
+        self.lines()
+        self.view.putstr(2, 0, 'xyz')
+        self.view.clear()
+        self.assertEqual(self.view.paragraphs, ['a', 'b'])
+        self.assertEqual(self.lines(), ['a     ', 'b     ', '      '])
+
+    def test_scroll_into_paragraph(self):
+        self.view.extend(['aaa bbb ccc', 'e'])
+        self.view.scroll_to(2)
+        self.assertEqual(self.lines(), ['ccc   ', 'e     ', '      '])
+
+    def test_incremental(self):
+        self.view.extend(['a', 'b b', 'c'])
+        self.assertEqual(self.view.line_count, 3)
+        first = self.view._breaks[0]
+        self.view.replace(1, 'bbbbbbb')
+        self.view.append('d')
+        self.assertEqual(self.view.line_count, 5)
+        self.assertIs(self.view._breaks[0], first)
+        self.view.remove(0)
+        self.assertEqual(self.view.line_count, 4)
+        self.assertEqual(self.lines(), ['b     ', 'c     ', 'd     '])
@@ -0,0 +1,52 @@
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import os
+import unittest
+
+from dirtywords import base
+from dirtywords.base import Screen
+from dirtywords.grid import Grid
+
+from . import test_base
+
+try:
+    from dirtywords.numpy import NumpyGrid
+except ImportError:
+    NumpyGrid = None
+
+
+@unittest.skipIf(NumpyGrid is None, 'numpy not available')
+class TestNumpyGrid(test_base.TestGrid):
+    grid_class = NumpyGrid
+
+    def test_opt_in(self):
+        old = os.environ.pop('DIRTYWORDS_GRID', None)
+        try:
+            base._grid_class = None
+            self.assertNotIsInstance(Screen(1, 1).data, NumpyGrid)
+            os.environ['DIRTYWORDS_GRID'] = 'numpy'
+            base._grid_class = None
+            self.assertIsInstance(Screen(1, 1).data, NumpyGrid)
+        finally:
+            os.environ.pop('DIRTYWORDS_GRID')
+            if old is not None:
+                os.environ['DIRTYWORDS_GRID'] = old
+            base._grid_class = None
+
+    def test_copy_to_grid(self):
+        self.grid.put(1, 0, 'abc')
+        grid = Grid(3, 5)
+        self.assertEqual(grid.copy_from(self.grid, 1, 1, 0, 0, 5), (0, 2))
+        self.assertEqual(grid.text(0), 'bc   ')
+        self.assertEqual(grid.diff(self.grid), [(0, 0, 2), (1, 0, 3)])
+
+    def test_putstr_past_edge(self):
+        scr = Screen(3, 10)
+        scr.data = NumpyGrid(3, 10)
+        scr.pop_dirty()
+        scr.putstr(0, 12, 'abcdef')
+        scr.putstr(2, 10, 'abcdefghijkl')
+        scr.blit(1, 10, ['abc', 'def'])
+        self.assertEqual(scr.pop_dirty(), [])
+        self.assertEqual(scr.data.text(1), ' ' * 10)
@@ -1,7 +1,11 @@
 from __future__ import absolute_import
 
+import os
 import unittest
 
+from dirtywords.base import AttrString
+from dirtywords.style import DEFAULT
+
 from . import shared_core
 
 try:
@@ -24,3 +28,87 @@ class TestPygame(shared_core.TestCore):
     @unittest.expectedFailure
     def test_getch_upper_ascii(self):
         super(TestPygame, self).test_getch_upper_ascii()
+
+
+@unittest.skipIf(pygame is None, 'pygame not available')
+class TestPygameHeadless(unittest.TestCase):
+    def setUp(self):
+        self.driver = os.environ.get('SDL_VIDEODRIVER')
+        os.environ['SDL_VIDEODRIVER'] = 'dummy'
+        self.scr = Screen(10, 10)
+
+    def tearDown(self):
+        self.scr.cleanup()
+        if self.driver is None:
+            del os.environ['SDL_VIDEODRIVER']
+        else:
+            os.environ['SDL_VIDEODRIVER'] = self.driver
+
+    def test_find_font(self):
+        from dirtywords.pygame import find_font
+
+        self.assertIs(find_font('monospace'), find_font('monospace'))
+        os.environ['DIRTYWORDS_FONT'] = '/some/font.ttf'
+        try:
+            self.assertEqual(find_font(), '/some/font.ttf')
+        finally:
+            del os.environ['DIRTYWORDS_FONT']
+
+    def test_run_cache(self):
+        self.scr.refresh()
+        self.assertEqual(self.scr.run_cache.misses, 1)
+        self.assertEqual(self.scr.run_cache.hits, 9)
+
+        self.scr.putstr(0, 0, 'aba')
+        self.scr.putstr(1, 0, 'aba')
+        self.scr.refresh()
+        self.assertEqual(len(self.scr.run_cache), 2)
+        self.assertEqual(self.scr.run_cache.hits, 10)
+
+    def test_glyph_cache(self):
+        self.scr.refresh()
+        self.scr.glyph_cache.clear()
+        self.scr.putstr(0, 0, AttrString('a', strong=True))
+        self.scr.putstr(1, 1, 'a')
+        self.scr.refresh()
+        self.assertEqual(len(self.scr.glyph_cache), 2)
+
+    def test_blits(self):
+        self.scr.refresh()
+        self.scr.enable_stats()
+        self.scr.putstr(0, 0, 'ab' + AttrString('cd', strong=True))
+        self.scr.refresh()
+        self.assertEqual(self.scr.last_stats.output, 2)
+
+    def test_run_matches_glyphs(self):
+        run = self.scr._render_text('ab', DEFAULT)
+        for i, ch in enumerate('ab'):
+            glyph = self.scr._render_ch(ch, DEFAULT)
+            self.assertEqual(
+                pygame.image.tobytes(run.subsurface(
+                    (i * self.scr.fontwidth, 0) + glyph.get_size()), 'RGB'),
+                pygame.image.tobytes(glyph, 'RGB'))
+
+    def test_scroll(self):
+        h = self.scr.fontheight
+        self.scr.putstr(1, 0, 'a')
+        self.scr.refresh()
+        pixels = self.scr.pygame_screen.subsurface(
+            (0, h, self.scr.fontwidth, h)).copy()
+        self.scr.scroll(1)
+        self.scr.refresh()
+        self.assertEqual(self.scr.data.text(0)[0], 'a')
+        scrolled = self.scr.pygame_screen.subsurface(
+            (0, 0, self.scr.fontwidth, h))
+        self.assertEqual(
+            pygame.image.tobytes(scrolled, 'RGB'),
+            pygame.image.tobytes(pixels, 'RGB'))
+
+    def test_dirty_rects(self):
+        w = self.scr.fontwidth
+        h = self.scr.fontheight
+        rects = self.scr._get_rects([(1, 2, 4), (2, 2, 4), (3, 0, 1)])
+        self.assertEqual(rects, [
+            pygame.Rect(2 * w, h, 2 * w, 2 * h),
+            pygame.Rect(0, 3 * h, w, h),
+        ])
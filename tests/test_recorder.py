@@ -0,0 +1,77 @@
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import io
+import json
+import unittest
+
+from dirtywords.base import AttrString
+from dirtywords.headless import Screen
+from dirtywords.recorder import Recorder
+from dirtywords.recorder import Recording
+from dirtywords.recorder import replay
+
+
+class TestRecorder(unittest.TestCase):
+    def setUp(self):
+        self.scr = Screen(3, 5)
+        self.fh = io.StringIO()
+        self.recorder = Recorder(self.scr, self.fh, keyframe_interval=3)
+
+        self.scr.putstr(0, 0, AttrString('ab', strong=True))
+        self.scr.refresh()
+        self.scr.putstr(1, 1, 'c')
+        self.scr.refresh()
+        self.scr.refresh()  # nothing changed
+        self.scr.scroll(1)
+        self.scr.refresh()
+        self.scr.putstr(2, 0, 'd')
+        self.scr.refresh()
+        self.recorder.close()
+
+    def events(self):
+        return [json.loads(line) for line in self.fh.getvalue().splitlines()]
+
+    def test_format(self):
+        events = self.events()
+        self.assertEqual(events[0]['height'], 3)
+        self.assertEqual(
+            [e[1] for e in events[1:]], ['s', 's', 'k', 'f', 'r', 'f', 'k'])
+        self.assertEqual(events[5][2], [1, 0, 3])
+        self.assertEqual(events[6][2], [])
+        self.assertEqual(events[4][2], [[1, 1, 'c', events[2][2][0]]])
+        self.assertEqual(self.recorder.frames, 4)
+
+    def test_close(self):
+        self.scr.putstr(0, 0, 'x')
+        self.scr.refresh()
+        self.assertEqual(len(self.events()), 8)
+
+    def test_replay(self):
+        self.fh.seek(0)
+        scr = Screen(3, 5)
+        self.assertEqual(replay(self.fh, scr, speed=None), 4)
+        self.assertEqual(scr.terminal.lines(), self.scr.terminal.lines())
+        self.assertEqual(scr.terminal.lines(), [' c   ', '     ', 'd    '])
+
+    def test_replay_start(self):
+        # use one second per event so that the times are distinct
+        events = self.events()
+        lines = [json.dumps(events[0])]
+        for i, event in enumerate(events[1:]):
+            lines.append(json.dumps([i] + event[1:]))
+        fh = io.StringIO('\n'.join(lines) + '\n')
+
+        scr = Screen(3, 5)
+        self.assertEqual(replay(fh, scr, speed=None, start=5), 2)
+        self.assertEqual(scr.terminal.lines(), [' c   ', '     ', 'd    '])
+
+    def test_recording(self):
+        self.fh.seek(0)
+        recording = Recording(self.fh)
+        self.assertEqual((recording.height, recording.width), (3, 5))
+        t, keyframe, scrolls, runs = next(iter(recording))
+        self.assertTrue(keyframe)
+        self.assertEqual(scrolls, [])
+        self.assertEqual(runs[0][:3], (0, 0, 'ab'))
+        self.assertTrue(runs[0][3].strong)
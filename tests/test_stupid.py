@@ -1,9 +1,24 @@
 from __future__ import absolute_import
 
+import io
+import os
+import sys
+import threading
+import time
+import unittest
+
+import six
+
 from dirtywords.stupid import Screen
 
 from . import shared_core
 
+try:
+    import pty
+    import termios
+except ImportError:
+    termios = None
+
 
 class TestStupid(shared_core.TestCore):
     def setUp(self):
@@ -13,3 +28,99 @@ class TestStupid(shared_core.TestCore):
     def tearDown(self):
         self.scr.cleanup()
         super(TestStupid, self).tearDown()
+
+
+@unittest.skipIf(termios is None, 'pty not available')
+class TestRawMode(unittest.TestCase):
+    def setUp(self):
+        self.master, slave = pty.openpty()
+        self.stdin = io.open(slave, 'rb', buffering=0)
+        self.orig = termios.tcgetattr(slave)
+        self._stdin, self._stdout = sys.stdin, sys.stdout
+        sys.stdin = self.stdin
+        sys.stdout = io.BytesIO() if six.PY2 else io.StringIO()
+
+    def tearDown(self):
+        sys.stdin, sys.stdout = self._stdin, self._stdout
+        self.stdin.close()
+        os.close(self.master)
+
+    def lflag(self):
+        return termios.tcgetattr(self.stdin.fileno())[3]
+
+    def test_raw_mode(self):
+        with Screen(2, 2, ansi=True) as scr:
+            attrs = termios.tcgetattr(self.stdin.fileno())
+            self.assertFalse(attrs[3] & (termios.ECHO | termios.ICANON))
+            self.assertTrue(attrs[3] & termios.ISIG)
+            self.assertTrue(attrs[1] & termios.OPOST)
+
+            os.write(self.master, b'a')
+            self.assertEqual(scr.getch(), 97)
+            self.assertEqual(scr.getch(blocking=False), None)
+            # reading does not touch the terminal settings again
+            self.assertEqual(termios.tcgetattr(self.stdin.fileno()), attrs)
+
+        self.assertEqual(termios.tcgetattr(self.stdin.fileno()), self.orig)
+        self.assertTrue(self.lflag() & termios.ECHO)
+
+    def test_cleanup(self):
+        scr = Screen(2, 2)
+        self.assertFalse(self.lflag() & termios.ECHO)
+        scr.cleanup()
+        self.assertEqual(termios.tcgetattr(self.stdin.fileno()), self.orig)
+        scr.cleanup()
+        self.assertEqual(termios.tcgetattr(self.stdin.fileno()), self.orig)
+
+    def test_bulk_read(self):
+        with Screen(2, 2, ansi=True) as scr:
+            os.write(self.master, b'a\x1b[Ab\x1b')
+            self.assertEqual(scr.getch(), 97)
+
+            # the remaining keys have already been read in one go
+            termios.tcflush(self.stdin.fileno(), termios.TCIFLUSH)
+            self.assertEqual(scr.getch(), 259)
+            self.assertEqual(scr.getch(), 98)
+            self.assertEqual(scr.getch(), 27)
+
+            os.write(self.master, b'\x1b[1;5A')
+            self.assertEqual(scr.getch(), 4355)
+            self.assertEqual(scr.getch(blocking=False), None)
+
+    def test_eof(self):
+        r, w = os.pipe()
+        sys.stdin = io.open(r, 'rb', buffering=0)
+        try:
+            with Screen(2, 2, ansi=True) as scr:
+                os.write(w, b'a\x1b')
+                os.close(w)
+                self.assertEqual(scr.getch(), 97)
+                self.assertEqual(scr.getch(), 27)
+                self.assertRaises(EOFError, scr.getch)
+        finally:
+            sys.stdin.close()
+
+    def test_key_events_with_repeat(self):
+        done = threading.Event()
+
+        def repeat():
+            # a key that is held down at 30 Hz for at most a second
+            for i in range(30):
+                if done.wait(1.0 / 30):
+                    break
+                os.write(self.master, b'a')
+
+        thread = threading.Thread(target=repeat)
+        with Screen(2, 2, ansi=True) as scr:
+            thread.start()
+            try:
+                time.sleep(0.1)
+                start = time.time()
+                events = list(scr.get_key_events())
+                self.assertLess(time.time() - start, 1.0 / 30)
+                self.assertEqual(
+                    [(e.type, e.key) for e in events], [('keydown', 97)])
+                self.assertEqual(scr.input_timeout, 0.1)
+            finally:
+                done.set()
+                thread.join()
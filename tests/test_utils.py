@@ -0,0 +1,25 @@
+from __future__ import absolute_import
+
+import unittest
+
+from dirtywords.utils import LRUCache
+
+
+class TestLRUCache(unittest.TestCase):
+    def test_eviction(self):
+        cache = LRUCache(2)
+        cache['a'] = 1
+        cache['b'] = 2
+        cache.get('a')
+        cache['c'] = 3
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertEqual(len(cache), 2)
+
+    def test_counters(self):
+        cache = LRUCache(2)
+        cache['a'] = 1
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get('b'), None)
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 1)